@@ -0,0 +1,151 @@
+"""
+Compares the single pass draw report tokenizer with the chain of re.sub calls
+DrawReportParser._clean_text used before, in segments per second. Both are
+checked to return the same segments first.
+
+The draw report PDFs are not in the repo, so by default the pages are rendered
+from assets/data/draw_results.csv in the layout pypdf extracts from the 2024
+Primary ELK report. Pass --pdf to time the text of a real report instead.
+
+Usage:
+    python benchmarks/bench_draw_tokenizer.py
+    python benchmarks/bench_draw_tokenizer.py --pdf "pdf/draw_result/Drawn Out At Report 2024 Primary ELK.pdf"
+"""
+
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+import pypdf
+from pypdf import PdfReader
+from app.cleaning.page_cache import CachedPdfReader, PageTextCache
+from app.cleaning.draw import tokenize_draw_text
+
+DRAW_RESULTS_PATH = (
+    Path(__file__).parent.parent
+    / "src"
+    / "app"
+    / "assets"
+    / "data"
+    / "draw_results.csv"
+)
+
+HUNT_CODES_PER_PAGE = 18
+
+
+def legacy_tokenize(text: str) -> list[str]:
+    """DrawReportParser._clean_text and the normalization at the top of
+    _parse_text before the single pass tokenizer."""
+    raw_text = re.sub(r"Pref \nPoints \n|Pref \nPoints |Pref Points", "", text)
+    raw_text = re.sub(r"\nNone \nDrawn|None \nDrawn|None Drawn", "ND", raw_text)
+    raw_text = re.sub(r"No Apps", "no-apps", raw_text)
+    raw_text = re.sub(r"Choice ", "Choice-", raw_text)
+    raw_text = re.sub(r"Leftover \nChoice", "Leftover-Choice", raw_text)
+    raw_text = re.sub(r" of \n| of ", "/", raw_text)
+    raw_text = re.sub(r"\nEE", "split_marker EE", raw_text)
+    raw_text = re.sub(r"\nEF", "split_marker EF", raw_text)
+    raw_text = re.sub(r"\nEM", "split_marker EM", raw_text)
+    raw_text = re.sub(r"\nEP", "split_marker EP", raw_text)
+    raw_text = re.sub(r"\nDrawn Out At| Drawn Out At", "split_marker DRA", raw_text)
+    raw_text = re.sub(
+        r"\n# Drawn at Final Level| # Drawn at Final Level",
+        "split_marker DAFL",
+        raw_text,
+    )
+
+    return [
+        elt.strip().replace("\n", " ")
+        for elt in re.split(r"split_marker |\*  Hunts shaded", raw_text)
+    ]
+
+
+def render_value(value: str) -> str:
+    """Writes a cleaned draw value back the way it appears in the extracted text."""
+    if value == "ND":
+        return "None \nDrawn "
+    if value == "no-apps":
+        return "No Apps "
+    if value.startswith("Leftover-Choice-"):
+        return f"Leftover \nChoice {value.rsplit('-', 1)[1]} "
+    if value.startswith("Choice-"):
+        return f"Choice {value.split('-')[1]} "
+    if value.isdigit():
+        return f"{value} Pref \nPoints \n"
+    if "/" in value:
+        return value.replace("/", " of ") + " "
+
+    return f"{value} "
+
+
+def synthetic_pages() -> list[str]:
+    draw_df = pd.read_csv(DRAW_RESULTS_PATH, dtype=str).fillna("N/A")
+
+    draw_cols = [col for col in draw_df.columns if col.endswith("draw_at")]
+
+    records = []
+    for row in draw_df.itertuples(index=False):
+        row = row._asdict()
+
+        dra = "".join(render_value(row[col]) for col in draw_cols[:6])
+        dafl = "".join(render_value(row[col]) for col in draw_cols[6:])
+
+        records.append(
+            f"{row['hunt_code']} {row['list_code']} \nDrawn Out At {dra}\n"
+            f"# Drawn at Final Level {dafl}"
+        )
+
+    header = (
+        "Drawn Out At Report 2024 Primary ELK \nHunt Code List Adult Res Adult Non-Res "
+    )
+    footer = "\n*  Hunts shaded in gray had fewer than 10 applicants"
+
+    return [
+        header + "\n" + "\n".join(records[i : i + HUNT_CODES_PER_PAGE]) + footer
+        for i in range(0, len(records), HUNT_CODES_PER_PAGE)
+    ]
+
+
+def pdf_pages(pdf_path: str) -> list[str]:
+    with PageTextCache() as cache:
+        reader = CachedPdfReader(
+            pdf_path, PdfReader, f"pypdf-{pypdf.__version__}", cache=cache
+        )
+
+        return [page.extract_text() for page in reader.pages]
+
+
+def segments_per_second(tokenize, pages: list[str], repeat: int) -> float:
+    segment_count = 0
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in pages:
+            segment_count += len(tokenize(text))
+    elapsed = time.perf_counter() - start
+
+    return segment_count / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the draw report tokenizer")
+    parser.add_argument("--pdf", help="draw report to read the page text from")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = pdf_pages(args.pdf) if args.pdf else synthetic_pages()
+
+    for text in pages:
+        assert tokenize_draw_text(text) == legacy_tokenize(text)
+
+    legacy_rate = segments_per_second(legacy_tokenize, pages, args.repeat)
+    single_pass_rate = segments_per_second(tokenize_draw_text, pages, args.repeat)
+
+    print(f"{len(pages)} pages, {sum(len(text) for text in pages):,} characters")
+    print(f"re.sub chain: {legacy_rate:,.0f} segments/s")
+    print(f"single pass:  {single_pass_rate:,.0f} segments/s")
+    print(f"speedup:      {single_pass_rate / legacy_rate:.2f}x")
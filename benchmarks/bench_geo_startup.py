@@ -0,0 +1,82 @@
+"""
+Compares loading the GMU boundaries the old way (read cpw_gmu.geojson, then
+simplify and title case counties with .apply) against reading the prepared
+GeoParquet file written by app.cleaning.geo. Each variant runs in a fresh
+interpreter and reports load time and how much the process RSS grew.
+
+Usage:
+    python benchmarks/bench_geo_startup.py
+    python benchmarks/bench_geo_startup.py --geojson path/to/cpw_gmu.geojson
+"""
+
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+SRC_DIRECTORY = Path(__file__).parent.parent / "src"
+
+sys.path.insert(0, str(SRC_DIRECTORY))
+
+from app.cleaning.geo import GMU_GEOJSON_PATH, build_geo_store
+
+LOAD_SCRIPT = """
+import json, resource, sys, time
+import geopandas as gpd
+
+def rss_kb():
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * resource.getpagesize() // 1024
+
+variant, path = sys.argv[1], sys.argv[2]
+rss_before = rss_kb()
+start = time.perf_counter()
+
+if variant == "geojson":
+    gdf = gpd.read_file(path)
+    gdf = gdf.rename(columns={"GMUID": "GMU", "COUNTY": "County", "ELKDAU": "Elk DAU"})
+    gdf["County"] = gdf.County.apply(lambda x: "/".join([county.title() for county in x.split()]))
+    gdf["geometry"] = gdf["geometry"].apply(lambda x: x.simplify(0.001))
+else:
+    gdf = gpd.read_parquet(path)
+
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "rss_kb": rss_kb() - rss_before}))
+"""
+
+
+def run_variant(variant: str, path: Path) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", LOAD_SCRIPT, variant, str(path)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GMU geometry startup benchmark")
+    parser.add_argument("--geojson", type=Path, default=GMU_GEOJSON_PATH)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        parquet_path = Path(tmp_dir) / "cpw_gmu.parquet"
+
+        build_geo_store(args.geojson, parquet_path)
+
+        print(f"geojson: {args.geojson.stat().st_size / 1e6:.2f} MB")
+        print(f"parquet: {parquet_path.stat().st_size / 1e6:.2f} MB")
+
+        for variant, path in [("geojson", args.geojson), ("parquet", parquet_path)]:
+            runs = [run_variant(variant, path) for _ in range(args.repeat)]
+
+            best = min(runs, key=lambda run: run["seconds"])
+
+            print(
+                f"{variant:<8} load {best['seconds']:.3f}s  rss +{best['rss_kb'] / 1024:.1f} MB"
+            )
@@ -0,0 +1,51 @@
+"""
+Compares serial and parallel wall clock time for turning the bundled
+harvest report PDFs into a CSV file, and checks both runs write the same bytes.
+
+Usage:
+    python benchmarks/bench_harvest_ingest.py --workers 4
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from app.cleaning.harvest import pdf_to_csv
+
+
+def time_pdf_to_csv(workers: int, output_path: Path) -> float:
+    start = time.perf_counter()
+
+    pdf_to_csv(
+        workers=workers,
+        output_path=output_path,
+        shard_directory=output_path.parent / f"shards_{workers}",
+        rebuild=True,
+    )
+
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Harvest ingestion benchmark")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        serial_path = Path(tmp_dir) / "serial.csv"
+        parallel_path = Path(tmp_dir) / "parallel.csv"
+
+        serial_seconds = time_pdf_to_csv(1, serial_path)
+        parallel_seconds = time_pdf_to_csv(args.workers, parallel_path)
+
+        identical = serial_path.read_bytes() == parallel_path.read_bytes()
+
+    print(f"serial:           {serial_seconds:8.2f}s")
+    print(f"parallel ({args.workers:>2} wk): {parallel_seconds:8.2f}s")
+    print(f"speedup:          {serial_seconds / parallel_seconds:8.2f}x")
+    print(f"identical output: {identical}")
@@ -0,0 +1,83 @@
+"""
+Shows how many pages of each bundled harvest report the harvest page selection
+skips and how much faster a cold parse of the report is because of it.
+The page text cache is pointed at a fresh directory for every run so both
+sides pay for text extraction.
+
+Usage:
+    python benchmarks/bench_harvest_page_selection.py
+"""
+
+import sys
+import glob
+import time
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import PyPDF2
+from app.cleaning.page_cache import CachedPdfReader, PageTextCache
+from app.cleaning.harvest import (
+    HARVEST_PDF_DIRECTORY,
+    parse_pdf_harvest_data,
+    select_harvest_pages,
+)
+
+
+@contextmanager
+def cold_reader(pdf_file: str) -> Iterator[CachedPdfReader]:
+    with (
+        tempfile.TemporaryDirectory() as cache_directory,
+        PageTextCache(Path(cache_directory) / "page_text.sqlite") as cache,
+    ):
+        yield CachedPdfReader(
+            pdf_file, PyPDF2.PdfReader, f"PyPDF2-{PyPDF2.__version__}", cache=cache
+        )
+
+
+def time_parse(pdf_file: str, select_pages: bool):
+    with cold_reader(pdf_file) as reader:
+        start = time.perf_counter()
+
+        df = parse_pdf_harvest_data(reader, select_pages=select_pages)
+
+        seconds = time.perf_counter() - start
+
+    return df, seconds
+
+
+def count_selected_pages(pdf_file: str) -> tuple[int, int]:
+    with cold_reader(pdf_file) as reader:
+        selected_pages = select_harvest_pages(reader)
+
+        return len(reader.pages), len(selected_pages)
+
+
+if __name__ == "__main__":
+    print(
+        f"{'report':<46} {'pages':>5} {'skipped':>7} {'all (s)':>8} {'selected (s)':>12} {'speedup':>7} same"
+    )
+
+    total_all_seconds = 0
+    total_selected_seconds = 0
+    for pdf_file in sorted(glob.glob(str(HARVEST_PDF_DIRECTORY / "*.pdf"))):
+        all_df, all_seconds = time_parse(pdf_file, select_pages=False)
+        selected_df, selected_seconds = time_parse(pdf_file, select_pages=True)
+        page_count, selected_count = count_selected_pages(pdf_file)
+
+        total_all_seconds += all_seconds
+        total_selected_seconds += selected_seconds
+
+        print(
+            f"{Path(pdf_file).name:<46} {page_count:>5} {page_count - selected_count:>7} "
+            f"{all_seconds:>8.2f} {selected_seconds:>12.2f} "
+            f"{all_seconds / selected_seconds:>6.1f}x {all_df.equals(selected_df)}"
+        )
+
+    print(
+        f"{'total':<60} {total_all_seconds:>8.2f} {total_selected_seconds:>12.2f} "
+        f"{total_all_seconds / total_selected_seconds:>6.1f}x"
+    )
@@ -0,0 +1,98 @@
+"""
+Reports how many bytes the map sends for every GMU boundary level, with full
+precision and with quantized coordinates (see app.cleaning.geo.simplify_coverage):
+
+- figure: the figure JSON st.plotly_chart sends when the GeoJSON is inlined,
+  which is what happens without server.enableStaticServing
+- geojson: the static GeoJSON file the browser fetches once when it is served,
+  the figure then only holds the URL and the per unit values
+
+Usage:
+    python benchmarks/bench_map_payload.py
+    python benchmarks/bench_map_payload.py --geojson path/to/cpw_gmu.geojson
+"""
+
+import sys
+import json
+import argparse
+from types import SimpleNamespace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import geopandas as gpd
+import plotly.io as pio
+import app.helpers.graphs
+from app.cleaning.geo import (
+    GMU_GEOJSON_PATH,
+    ZOOM_TOLERANCES,
+    prepare_gmu_geometries,
+    zoom_level_column,
+)
+from app.helpers.cache_state import get_hunting_data
+from app.helpers.graphs import gmu_geo_json, plot_annual_data
+from app.helpers.hunting_index import HuntingIndex
+
+
+def payload_sizes(gdf: gpd.GeoDataFrame, year_df, geometry_col: str) -> dict:
+    geo_json = gmu_geo_json(gdf, geometry_col)
+
+    fig = plot_annual_data(gdf, year_df, "Total Hunters", 1.0, geo_json)
+
+    return {
+        "figure": len(pio.to_json(fig, validate=False)),
+        "geojson": len(json.dumps(geo_json, separators=(",", ":"))),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Map payload size report")
+    parser.add_argument("--geojson", type=Path, default=GMU_GEOJSON_PATH)
+    parser.add_argument("--year", type=int, default=2023)
+    args = parser.parse_args()
+
+    # plot_annual_data reads the map settings st_sidebar keeps in session state
+    app.helpers.graphs.st.session_state = SimpleNamespace(
+        map_zoom=7, is_mobile=False, map_layout={}
+    )
+
+    year_df = HuntingIndex(get_hunting_data.__wrapped__()).year_slice(args.year)
+
+    raw_gdf = gpd.read_file(args.geojson)
+
+    gdf_by_precision = {
+        "full": prepare_gmu_geometries(raw_gdf, quantize=False),
+        "quantized": prepare_gmu_geometries(raw_gdf, quantize=True),
+    }
+
+    print(
+        f"{'zoom':>4} {'tolerance':>9} {'figure full':>12} {'quantized':>10} {'saved':>6}"
+        f" {'geojson full':>13} {'quantized':>10} {'saved':>6}"
+    )
+
+    for zoom, tolerance in ZOOM_TOLERANCES.items():
+        geometry_col = zoom_level_column(zoom)
+
+        full, quantized = (
+            payload_sizes(gdf, year_df, geometry_col)
+            for gdf in gdf_by_precision.values()
+        )
+
+        print(
+            f"{zoom:>4} {tolerance:>9} {full['figure']:>12,} {quantized['figure']:>10,}"
+            f" {1 - quantized['figure'] / full['figure']:>6.0%}"
+            f" {full['geojson']:>13,} {quantized['geojson']:>10,}"
+            f" {1 - quantized['geojson'] / full['geojson']:>6.0%}"
+        )
+
+    fig = plot_annual_data(
+        gdf_by_precision["quantized"],
+        year_df,
+        "Total Hunters",
+        1.0,
+        "app/static/cpw_gmu.geojson",
+    )
+
+    print(
+        f"figure with the GeoJSON served statically: {len(pio.to_json(fig, validate=False)):,}"
+    )
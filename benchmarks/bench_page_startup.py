@@ -0,0 +1,135 @@
+"""
+Reports, for every page, how long a fresh server process takes to import what
+main.py imports and to finish the page's first run, with the data loaded the
+old way (eagerly by main.py before every page), lazily by the pages, or warmed
+in a background thread (STARTUP_MODE=warm). Each measurement runs in a fresh
+interpreter, so imports and data loads are cold like for the first visitor of a
+new container.
+
+The first run of the page script stands in for time to first paint, Streamlit
+sends the page's elements while the script runs and the page is complete once it
+has finished.
+
+Usage:
+    python benchmarks/bench_page_startup.py
+    python benchmarks/bench_page_startup.py --repeat 5
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+SRC_DIRECTORY = Path(__file__).parent.parent / "src"
+
+PAGES_DIRECTORY = SRC_DIRECTORY / "app" / "st_pages"
+
+PAGES = ["overview.py", "interactive_map.py", "unit_trends.py", "draw_odds.py"]
+
+MODES = ["eager", "lazy", "warm"]
+
+HEAVY_MODULES = ["pandas", "geopandas", "shapely", "pypdf", "pyarrow"]
+
+# main.py with the page run in place of st.navigation, AppTest does not run
+# pages returned by st.navigation.
+ENTRYPOINT = """
+from pathlib import Path
+import streamlit as st
+from app.helpers.cache_state import st_sidebar, get_geo_data, get_hunting_data, warm_up
+from app.helpers.timing import page_run
+
+st_sidebar()
+
+if {mode!r} == "warm":
+    warm_up()
+
+with page_run({page!r}):
+    if {mode!r} == "eager":
+        get_geo_data()
+        get_hunting_data()
+
+    page_globals = {{"__file__": {page_path!r}, "__name__": "__page__"}}
+
+    exec(compile(Path({page_path!r}).read_text(), {page_path!r}, "exec"), page_globals)
+"""
+
+STARTUP_SCRIPT = """
+import json, sys, time
+
+start = time.perf_counter()
+
+import streamlit
+import app.helpers.cache_state
+import app.helpers.timing
+
+import_seconds = time.perf_counter() - start
+
+loaded = [module for module in {heavy_modules!r} if module in sys.modules]
+
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_string({entrypoint!r}, default_timeout=300)
+
+start = time.perf_counter()
+
+at.run()
+
+print(json.dumps({{
+    "import_seconds": import_seconds,
+    "first_run_seconds": time.perf_counter() - start,
+    "loaded": loaded,
+    "error": at.exception[0].message if at.exception else None,
+}}))
+"""
+
+
+def measure(page: str, mode: str) -> dict:
+    entrypoint = ENTRYPOINT.format(
+        mode=mode, page=page, page_path=str(PAGES_DIRECTORY / page)
+    )
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            STARTUP_SCRIPT.format(heavy_modules=HEAVY_MODULES, entrypoint=entrypoint),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(SRC_DIRECTORY)},
+    )
+
+    # The warm up thread may still log after the result line.
+    return next(
+        json.loads(line)
+        for line in result.stdout.splitlines()
+        if line.startswith('{"import_seconds"')
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Page startup benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'page':<20} {'mode':<6} {'import (s)':>10} {'first run (s)':>13}  heavy modules imported by main.py"
+    )
+
+    for page in PAGES:
+        for mode in MODES:
+            runs = [measure(page, mode) for _ in range(args.repeat)]
+
+            best = min(runs, key=lambda run: run["first_run_seconds"])
+
+            if best["error"]:
+                print(f"{page:<20} {mode:<6} failed: {best['error']}")
+                continue
+
+            print(
+                f"{page:<20} {mode:<6} {best['import_seconds']:>10.2f} "
+                f"{best['first_run_seconds']:>13.2f}  {', '.join(best['loaded']) or '-'}"
+            )
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+from pathlib import Path
+import pytest
+import geopandas as gpd
+from shapely.geometry import box
+from app.helpers.cache_state import get_geo_data, get_hunting_data
+from app.helpers.graphs import gmu_geo_json
+
+ASSET_DIRECTORY = Path(__file__).parent.parent / "src" / "app" / "assets" / "data"
+
+
+@pytest.fixture(scope="session")
+def geo_assets_available() -> bool:
+    return any(
+        (ASSET_DIRECTORY / fname).exists()
+        for fname in ("cpw_gmu.parquet", "cpw_gmu.geojson")
+    )
+
+
+@pytest.fixture(scope="session")
+def hunter_df():
+    return get_hunting_data.__wrapped__()
+
+
+@pytest.fixture(scope="session")
+def gmu_gdf(hunter_df, geo_assets_available):
+    """The prepared GMU boundaries, or a grid of squares for the same units when
+    the boundary files are not in the checkout."""
+    if geo_assets_available:
+        return get_geo_data.__wrapped__()
+
+    units = sorted(hunter_df.Unit.cat.categories)
+
+    return gpd.GeoDataFrame(
+        {
+            "GMU": units,
+            "County": ["Montrose"] * len(units),
+            "Elk DAU": ["E-20"] * len(units),
+        },
+        geometry=[
+            box(
+                -109 + i % 20 * 0.35,
+                37 + i // 20 * 0.4,
+                -108.7 + i % 20 * 0.35,
+                37.35 + i // 20 * 0.4,
+            )
+            for i in range(len(units))
+        ],
+        crs="EPSG:4326",
+    )
+
+
+@pytest.fixture(scope="session")
+def gmu_geo_json_dict(gmu_gdf):
+    return gmu_geo_json(gmu_gdf)
+
+
+@pytest.fixture
+def session_state(monkeypatch):
+    """Plots read the map and layout settings main.py keeps in session state."""
+    state = SimpleNamespace(
+        map_zoom=5, is_mobile=True, map_layout={}, trend_update_layout={}
+    )
+
+    monkeypatch.setattr("app.helpers.graphs.st.session_state", state)
+
+    return state
@@ -0,0 +1,101 @@
+"""
+pytest-benchmark suite for the cleaning and plotting hot paths. It is kept out
+of the normal test run (testpaths is tests/), run it on its own:
+
+    pytest benchmarks --benchmark-save=baseline
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+
+The first command saves a baseline under .benchmarks/, the second compares
+against the latest saved run and fails when a benchmark's mean got more than 10%
+slower. Compare runs made on the same machine.
+"""
+
+from unittest.mock import MagicMock
+import pytest
+import PyPDF2
+from app.cleaning.draw import DrawReportParser
+from app.cleaning.harvest import (
+    HARVEST_PDF_DIRECTORY,
+    parse_pdf_harvest_data,
+    parse_rows,
+)
+from app.helpers.cache_state import get_geo_data, get_hunting_data
+from app.helpers.graphs import plot_annual_data, plot_metrics, summarize_statewide
+from app.helpers.hunting_index import HuntingIndex
+from bench_draw_tokenizer import synthetic_pages
+
+HARVEST_PDF = HARVEST_PDF_DIRECTORY / "2023StatewideElkHuntingHarvestEstimates.pdf"
+
+
+def test_parse_rows(benchmark):
+    page_lines = [f" {unit} 22 31 0 53 251 21 1,041 " for unit in range(1, 200)]
+
+    assert len(benchmark(parse_rows, page_lines)) == 199
+
+
+def test_parse_pdf_harvest_data(benchmark):
+    """Full text extraction of a bundled report, no page cache."""
+    df = benchmark.pedantic(
+        lambda: parse_pdf_harvest_data(PyPDF2.PdfReader(HARVEST_PDF)),
+        rounds=3,
+        iterations=1,
+    )
+
+    assert set(df.method_of_take) == {"archery", "muzzleloader", "rifle", "all"}
+
+
+def test_draw_report_pdf_to_csv(benchmark):
+    pages = []
+    for text in synthetic_pages():
+        page = MagicMock()
+        page.extract_text.return_value = text
+        pages.append(page)
+
+    def pdf_to_csv():
+        parser = DrawReportParser(MagicMock(pages=pages))
+        parser.pdf_to_csv()
+        return parser.df
+
+    assert len(benchmark(pdf_to_csv)) > 0
+
+
+def test_get_geo_data(benchmark, geo_assets_available):
+    if not geo_assets_available:
+        pytest.skip("cpw_gmu.parquet and cpw_gmu.geojson are not in the checkout")
+
+    assert len(benchmark(get_geo_data.__wrapped__)) > 0
+
+
+def test_get_hunting_data(benchmark):
+    assert len(benchmark(get_hunting_data.__wrapped__)) > 0
+
+
+@pytest.mark.parametrize("metric", ["Percent Success", "Total Hunters"])
+def test_plot_annual_data(
+    benchmark, session_state, hunter_df, gmu_gdf, gmu_geo_json_dict, metric
+):
+    """One map rerun, the year's units are colored and the GeoJSON is reused."""
+    year_df = HuntingIndex(hunter_df).year_slice(2023)
+
+    fig = benchmark(plot_annual_data, gmu_gdf, year_df, metric, 1.0, gmu_geo_json_dict)
+
+    assert len(fig.data) == 1
+
+
+@pytest.mark.parametrize("unit", ["All", 61])
+def test_plot_metrics(benchmark, session_state, hunter_df, unit):
+    statewide_df = summarize_statewide(hunter_df)
+    hunting_index = HuntingIndex(hunter_df)
+
+    fig = benchmark(
+        plot_metrics,
+        hunter_df,
+        ["Bulls", "Cows", "Calves"],
+        unit,
+        "Harvest",
+        [2006, 2023],
+        statewide_df,
+        hunting_index,
+    )
+
+    assert len(fig.data) == 3
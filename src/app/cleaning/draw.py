@@ -1,10 +1,20 @@
 import re
 import sys
+import shutil
 import logging
+import tempfile
+import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pypdf
 from pypdf import PdfReader
+from app.cleaning.page_cache import CachedPdfReader, PageTextCache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -14,295 +24,607 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+PROJECT_DIRECTORY = Path(__file__).parent.parent.parent.parent
+
+DRAW_PDF_DIRECTORY = PROJECT_DIRECTORY / "pdf" / "draw_result"
+
+DRAW_DATASET_DIRECTORY = (
+    Path(__file__).parent.parent / "assets" / "data" / "draw_results"
+)
+
+DRAW_REPORT_NAME_PATTERN = re.compile(
+    r"Drawn Out At Report (?P<year>\d{4}) (?P<draw_round>Primary|Secondary) "
+    r"(?P<species>ELK|DEER|PRONGHORN|MOOSE)\.pdf",
+    re.IGNORECASE,
+)
+
+DRAW_PARTITION_COLS = ["species", "year", "draw_round"]
+
+# ASCII record separator, marks where a segment starts. It never shows up in the
+# text extracted from a report.
+SEGMENT_SEPARATOR = "\x1e"
+
+# Every piece of text a draw report page needs rewritten and what it is rewritten
+# to, see tokenize_draw_text.
+DRAW_TOKENS = {
+    "Pref \nPoints \n": "",
+    "Pref \nPoints ": "",
+    "Pref Points": "",
+    "\nNone \nDrawn": "ND",
+    "None \nDrawn": "ND",
+    "None Drawn": "ND",
+    "No Apps": "no-apps",
+    "Leftover \nChoice ": "Leftover-Choice-",
+    "Leftover \nChoice": "Leftover-Choice",
+    "Choice ": "Choice-",
+    " of \n": "/",
+    " of ": "/",
+    "*  Hunts shaded": SEGMENT_SEPARATOR,
+}
+
+# First letter of a hunt code is the species, the second the sex of the animal,
+# e.g. EE001O1A is an either sex elk hunt and DM001O1R a buck deer hunt.
+HUNT_CODE_SPECIES = {"E": "elk", "D": "deer", "A": "pronghorn", "M": "moose"}
+
+HUNT_CODE_SEX = {
+    "E": "Either Sex",
+    "M": "Male",
+    "F": "Female",
+    "P": "Preference Point",
+}
+
+HUNT_CODE_METHODS = {
+    "A": "Archery",
+    "M": "muzzleloader",
+    "R": "rifle",
+    "X": "season choice",
+    "P": "NA",
+}
+
+# Sixth letter of the hunt code, kept as the letter CPW prints in the brochure
+HUNT_CODE_HUNT_TYPES = {letter: letter for letter in "OPWLESK"}
+
+HUNT_CODE_LENGTH = 8
+
+# Decoded column -> (position in the hunt code, lookup table for the letter).
+# Characters 2-4 are the GMU and 6 the season number.
+HUNT_CODE_POSITIONS = {
+    "species": (0, HUNT_CODE_SPECIES),
+    "animal_sex": (1, HUNT_CODE_SEX),
+    "hunt_type": (5, HUNT_CODE_HUNT_TYPES),
+    "method_of_take": (7, HUNT_CODE_METHODS),
+}
+
+LIST_CODES = ["A", "B", "C"]
+
+HUNT_CODE_PREFIXES = tuple(
+    species + sex for species in HUNT_CODE_SPECIES for sex in HUNT_CODE_SEX
+)
+
+SEGMENT_MARKERS = {
+    **{f"\n{prefix}": SEGMENT_SEPARATOR + prefix for prefix in HUNT_CODE_PREFIXES},
+    "\nDrawn Out At": SEGMENT_SEPARATOR + "DRA",
+    " Drawn Out At": SEGMENT_SEPARATOR + "DRA",
+    "\n# Drawn at Final Level": SEGMENT_SEPARATOR + "DAFL",
+    " # Drawn at Final Level": SEGMENT_SEPARATOR + "DAFL",
+}
+
+DRAW_TOKENS.update(SEGMENT_MARKERS)
+
+# Dropping the preference points in "4 Pref \nPoints \n# Drawn at Final Level"
+# leaves "4 # Drawn at Final Level", so a marker right after dropped preference
+# points still starts a segment.
+for marker, replacement in SEGMENT_MARKERS.items():
+    for pref_points in ("Pref \nPoints \n", "Pref \nPoints ", "Pref Points"):
+        DRAW_TOKENS[marker[0] + pref_points + marker[1:]] = replacement
+
+
+def _trie_pattern(tokens) -> str:
+    """Builds a regex matching any of the tokens with the common prefixes factored
+    out, e.g. ["No Apps", "None Drawn"] -> "No(?:\\ Apps|ne\\ Drawn)". The engine
+    then tests one branch per character instead of every token at every position.
+    A token that is the prefix of another is optional, so the longest token at a
+    position matches.
+
+    :param tokens: literal strings
+
+    :return: regex pattern
+    """
+    trie = {}
+    for token in tokens:
+        node = trie
+        for char in token:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [
+            re.escape(char) + build(child) for char, child in node.items() if char
+        ]
+
+        if not branches:
+            return ""
+
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+
+        return "(?:" + "|".join(branches) + ")" + ("?" if "" in node else "")
+
+    return build(trie)
+
+
+DRAW_TOKEN_PATTERN = re.compile("(" + _trie_pattern(DRAW_TOKENS) + ")")
+
+
+def tokenize_draw_text(text: str) -> list[str]:
+    """Splits the text of a draw report page into segments with one scan of the text.
+    Each segment is a hunt code and list code, the drawn out at results (starts with
+    DRA) or the final results (starts with DAFL). Preference points are dropped,
+    "None Drawn" becomes ND, "1 of 3" becomes 1/3, new lines become spaces and text
+    outside of those segments, like the page header, is kept as its own segment.
+
+    >>> tokenize_draw_text('EE001O1A A \nDrawn Out At 17 None \nDrawn ...')
+    ['EE001O1A A', 'DRA 17 ND ...']
+
+    :param text: extracted text of one page
+
+    :return: stripped segments in page order
+    """
+    parts = DRAW_TOKEN_PATTERN.split(text)
+
+    # split puts the matched tokens at the odd indices
+    parts[1::2] = map(DRAW_TOKENS.__getitem__, parts[1::2])
+
+    return [
+        segment.strip()
+        for segment in "".join(parts).replace("\n", " ").split(SEGMENT_SEPARATOR)
+    ]
+
+
+DRAW_AT_COLS = [
+    "adult_res_draw_at",
+    "adult_nonrest_draw_at",
+    "youth_res_draw_at",
+    "youth_nonrest_draw_at",
+    "landowner_unrestr_draw_at",
+    "landowner_restr_draw_at",
+]
+
+FINAL_DRAW_AT_COLS = [f"final_{col}" for col in DRAW_AT_COLS]
+
+DRAW_RESULT_COLS = ["hunt_code", "list_code"] + DRAW_AT_COLS + FINAL_DRAW_AT_COLS
+
+DRAW_RESULT_BATCH_SIZE = 500
+
+
+def _category_codes(chars: np.ndarray, lookup_table: dict) -> tuple[np.ndarray, list]:
+    """Looks up one character per hunt code in a table with a 128 entry array indexed
+    by the character's code point.
+
+    :param chars: unicode code points, one per hunt code
+    :param lookup_table: character -> label
+
+    :return: categorical codes (-1 when not in the table) and the categories
+    """
+    categories = list(dict.fromkeys(lookup_table.values()))
+
+    ascii_lookup = np.full(128, -1, dtype=np.int8)
+
+    for char, label in lookup_table.items():
+        ascii_lookup[ord(char)] = categories.index(label)
+
+    return ascii_lookup[np.minimum(chars, 127)], categories
+
+
+def add_hunt_code_cols(df: pd.DataFrame) -> pd.DataFrame:
+    """Decodes every part of the hunt code in one vectorized pass, e.g. EE001O1A is an
+    either sex elk hunt in GMU 001, regular (O) first season archery. The codes are
+    viewed as an (n, 8) array of code points and each position is looked up in its
+    HUNT_CODE_POSITIONS table, so the hunt_code column is only read once. Label
+    columns are categoricals with the table labels as categories, characters that
+    are not in a table are left null.
+
+    :param df: draw results with hunt_code and list_code columns
+
+    :return: df with the decoded columns
+    """
+    # One extra column so codes that are too long show up as a non zero code point,
+    # short codes are padded with zeros.
+    hunt_codes = df.hunt_code.to_numpy(dtype=f"U{HUNT_CODE_LENGTH + 1}")
+
+    chars = hunt_codes.view(np.uint32).reshape(-1, HUNT_CODE_LENGTH + 1)
+
+    is_hunt_code = (chars[:, HUNT_CODE_LENGTH - 1] != 0) & (
+        chars[:, HUNT_CODE_LENGTH] == 0
+    )
+
+    for col, (position, lookup_table) in HUNT_CODE_POSITIONS.items():
+        codes, categories = _category_codes(chars[:, position], lookup_table)
+
+        codes[~is_hunt_code] = -1
+
+        df[col] = pd.Categorical.from_codes(codes, categories=categories)
+
+    digits = chars[:, [2, 3, 4, 6]].astype(np.int64) - ord("0")
+
+    is_digit = (digits >= 0) & (digits <= 9) & is_hunt_code[:, None]
+
+    df["gmu"] = np.where(is_digit[:, :3].all(axis=1), df.hunt_code.str[2:5], None)
+
+    df["season"] = pd.array(np.where(is_digit[:, 3], digits[:, 3], None), dtype="Int8")
+
+    df["list_code"] = pd.Categorical(df["list_code"], categories=LIST_CODES)
+
+    return df
+
 
 class DrawReportParser:
+    """Parses a drawn out at report into one record per hunt code.
+
+    A record is split over three segments, the hunt code, the drawn out at results
+    (DRA) and the final results (DAFL). When a record is cut by a page break the
+    next page repeats the hunt code, so a hunt code segment for an unfinished
+    record continues it instead of starting a new one.
+
+    Example:
+    >>> parser = DrawReportParser(reader)
+    >>> next(parser.iter_records())
+    {'hunt_code': 'EE001E1R', 'list_code': 'A', 'adult_res_draw_at': '19', ...}
+
+    :param pdf_reader: PdfReader or CachedPdfReader of the report
+    """
+
     def __init__(self, pdf_reader):
-        self.all_data_dict = {
-            "hunt_code": [],
-            "list_code": [],
-            "adult_res_draw_at": [],
-            "adult_nonrest_draw_at": [],
-            "youth_res_draw_at": [],
-            "youth_nonrest_draw_at": [],
-            "landowner_unrestr_draw_at": [],
-            "landowner_restr_draw_at": [],
-            "final_adult_res_draw_at": [],
-            "final_adult_nonrest_draw_at": [],
-            "final_youth_res_draw_at": [],
-            "final_youth_nonrest_draw_at": [],
-            "final_landowner_unrestr_draw_at": [],
-            "final_landowner_restr_draw_at": [],
-        }
         self.reader = pdf_reader
-        self.max_len = 0
-        self.code_cols = ["hunt_code", "list_code"]
-        self.dra_cols = [
-            "adult_res_draw_at",
-            "adult_nonrest_draw_at",
-            "youth_res_draw_at",
-            "youth_nonrest_draw_at",
-            "landowner_unrestr_draw_at",
-            "landowner_restr_draw_at",
-        ]
-        self.final_dra_cols = [
-            "final_adult_res_draw_at",
-            "final_adult_nonrest_draw_at",
-            "final_youth_res_draw_at",
-            "final_youth_nonrest_draw_at",
-            "final_landowner_unrestr_draw_at",
-            "final_landowner_restr_draw_at",
-        ]
-        self.processed_text = None
-        self.length_diff = 0
+        self.record = None
         self.draw_data = None
-        self.have_code_cols = False
-        self.have_dra_cols = False
-        self.have_final_dra_cols = False
-        self.length_dict = None
         self.page_number = 0
         self.text_data = None
         self.df = None
 
     def _clean_text(self):
-        """Text data will be split by new lines. However, each hunt code will split into 3-10 lines. By removing certain text with
-        new line characters this will make the hunt code split into 3 lines, the hunt code and list code, drawn out at results and
-        final results.
-
-        >>> text_data = 'EE001E1R A \nDrawn Out At 19 Pref \nPoints \n30 Pref \nPoints \nNone \nDrawn \nNone \nDrawn 4 Pref Points 2 Pref Points \n# Drawn at Final Level 1 of 3 1 of 1 N/A N/A 1 of 2 1 of 3'
-        >>> drawReportParser(text_data=text_data)._clean_text()
-        >>> self.processed_text()
-        'EE001E1R A \nDrawn Out At 19 30 ND ND 4  2  \n# Drawn at Final Level 1/3 1/1 N/A N/A 1/2 1/3'
+        """Text data will be split by new lines. However, each hunt code will split into 3-10 lines. Tokenizing the text into
+        segments that start at a hunt code, the drawn out at results or the final results makes each hunt code 3 segments,
+        see tokenize_draw_text.
+
+        >>> parser = DrawReportParser(reader)
+        >>> parser.text_data = 'EE001E1R A \nDrawn Out At 19 Pref \nPoints \n30 Pref \nPoints \nNone \nDrawn \nNone \nDrawn 4 Pref Points 2 Pref Points \n# Drawn at Final Level 1 of 3 1 of 1 N/A N/A 1 of 2 1 of 3'
+        >>> parser._clean_text()
+        >>> parser.draw_data
+        ['EE001E1R A', 'DRA 19 30 ND ND 4  2', 'DAFL 1/3 1/1 N/A N/A 1/2 1/3']
         """
-        raw_text = re.sub(
-            r"Pref \nPoints \n|Pref \nPoints |Pref Points", "", self.text_data
-        )
+        self.draw_data = tokenize_draw_text(self.text_data)
 
-        raw_text = re.sub(r"\nNone \nDrawn|None \nDrawn|None Drawn", "ND", raw_text)
+    def _split_values(self, elt: str, prefix: str, expected_len: int) -> list[str]:
+        values = elt[len(prefix) :].split()
 
-        raw_text = re.sub(r"No Apps", "no-apps", raw_text)
+        if len(values) != expected_len:
+            raise ValueError(
+                f"Expected {expected_len} values in '{elt}'. Page number: {self.page_number}"
+            )
 
-        raw_text = re.sub(r"Choice ", "Choice-", raw_text)
+        return values
 
-        raw_text = re.sub(r"Leftover \nChoice", "Leftover-Choice", raw_text)
+    def _start_record(self, elt: str):
+        """Starts a record for a hunt code segment, or continues the unfinished
+        record if the hunt code was repeated after a page break."""
+        codes = self._split_values(elt, "", 2)
 
-        raw_text = re.sub(r" of \n| of ", "/", raw_text)
+        if self.record is not None:
+            if codes[0] != self.record["hunt_code"]:
+                raise ValueError(
+                    f"Hunt code {codes[0]} started before {self.record['hunt_code']} was finished. "
+                    f"Page number: {self.page_number}"
+                )
 
-        raw_text_with_split_markers = re.sub(r"\nEE", "split_marker EE", raw_text)
+            logger.info("Already have hunt code data for code: %s", codes[0])
 
-        raw_text_with_split_markers = re.sub(
-            r"\nEF", "split_marker EF", raw_text_with_split_markers
-        )
+            return
 
-        raw_text_with_split_markers = re.sub(
-            r"\nEM", "split_marker EM", raw_text_with_split_markers
-        )
+        self.record = {"hunt_code": codes[0], "list_code": codes[1]}
 
-        raw_text_with_split_markers = re.sub(
-            r"\nEP", "split_marker EP", raw_text_with_split_markers
-        )
+    def _finish_record(self) -> dict | None:
+        """Returns the record and starts over once it has every column."""
+        if len(self.record) < len(DRAW_RESULT_COLS):
+            return None
 
-        raw_text_with_split_markers = re.sub(
-            r"\nDrawn Out At| Drawn Out At",
-            "split_marker DRA",
-            raw_text_with_split_markers,
-        )
+        record, self.record = self.record, None
 
-        self.processed_text = re.sub(
-            r"\n# Drawn at Final Level| # Drawn at Final Level",
-            "split_marker DAFL",
-            raw_text_with_split_markers,
-        )
+        return record
 
-        self.draw_data = re.split(
-            r"split_marker |\*  Hunts shaded", self.processed_text
-        )
+    def _parse_text(self) -> Iterator[dict]:
+        """Yields the records finished by the segments of the current page."""
+        for elt in self.draw_data:
+            if elt.startswith(HUNT_CODE_PREFIXES) and elt.endswith(("A", "B", "C")):
+                self._start_record(elt)
+
+            elif elt.startswith(("DRA ", "DAFL")) and self.record is None:
+                if "Report" not in elt:
+                    logger.warning(
+                        "Skipping results without a hunt code: %s. Page number: %s",
+                        elt,
+                        self.page_number,
+                    )
 
-    def _elements_are_same(self, col_list):
-        """Check if all elements in a list are the same. If they are the same return True, else return False."""
-        return all(self.length_dict[col] == self.max_len for col in col_list)
+            elif elt.startswith("DRA ") and "Report" not in elt:
+                if DRAW_AT_COLS[0] in self.record:
+                    logger.info(
+                        "Already have DRA data for hunt code: %s",
+                        self.record["hunt_code"],
+                    )
+                    continue
 
-    def _verify_value(self):
-        """After the script runs all the data lists should be the same length. If they are not the same length the script will raise an error.
-        This function is a proactive way to catch errors in the data parsing process.
+                self.record.update(
+                    zip(DRAW_AT_COLS, self._split_values(elt, "DRA ", 6))
+                )
+
+                if record := self._finish_record():
+                    yield record
+
+            elif elt.startswith("DAFL"):
+                if FINAL_DRAW_AT_COLS[0] in self.record:
+                    logger.info(
+                        "Already have final data for hunt code: %s",
+                        self.record["hunt_code"],
+                    )
+                    continue
+
+                self.record.update(
+                    zip(FINAL_DRAW_AT_COLS, self._split_values(elt, "DAFL ", 6))
+                )
+
+                if record := self._finish_record():
+                    yield record
+
+    def iter_records(self) -> Iterator[dict]:
+        """Yields one validated record per hunt code as the pages are read, so
+        the first records are available before the whole report is parsed.
+
+        :return: dicts with the DRAW_RESULT_COLS keys
         """
-        value_lengths_key_array = [
-            (len(v), k) for k, v in hunt_code_parser.all_data_dict.items()
-        ]
+        for i, page in enumerate(self.reader.pages):
+            self.page_number = i
 
-        self.max_len = max(value_lengths_key_array)[0]
+            self.text_data = page.extract_text()
 
-        lengths_diffs_key_array = [
-            (length - self.max_len, k) for length, k in value_lengths_key_array
-        ]
+            self._clean_text()
+
+            yield from self._parse_text()
 
-        self.length_diff = min(lengths_diffs_key_array)[0]
+        if self.record is not None:
+            raise ValueError(
+                f"Report ended before hunt code {self.record['hunt_code']} was finished, "
+                f"have {list(self.record)}"
+            )
+
+    def pdf_to_csv(self):
+        self.df = add_hunt_code_cols(
+            pd.DataFrame(self.iter_records(), columns=DRAW_RESULT_COLS)
+        )
+
+
+def write_draw_results(
+    records: Iterable[dict],
+    output_path: Path,
+    batch_size: int = DRAW_RESULT_BATCH_SIZE,
+    drop_cols: list[str] | None = None,
+) -> int:
+    """Writes draw result records to a CSV or Parquet file batch_size records at a
+    time, so memory stays flat however large the report is.
+
+    :param records: dicts with the DRAW_RESULT_COLS keys, e.g. DrawReportParser.iter_records()
+    :param output_path: .csv or .parquet file to write
+    :param batch_size: number of records held in memory at once
+    :param drop_cols: decoded columns to leave out, e.g. the partition columns of
+        a dataset
+
+    :return: number of records written
+    """
+    output_path = Path(output_path)
+
+    if output_path.suffix not in (".csv", ".parquet"):
+        raise ValueError(f"Can not write draw results to {output_path.suffix} files")
+
+    records = iter(records)
+    parquet_writer = None
+    record_count = 0
+
+    try:
+        while batch := list(islice(records, batch_size)):
+            batch_df = add_hunt_code_cols(
+                pd.DataFrame(batch, columns=DRAW_RESULT_COLS)
+            ).drop(columns=drop_cols or [])
+
+            if output_path.suffix == ".csv":
+                batch_df.to_csv(
+                    output_path,
+                    mode="w" if record_count == 0 else "a",
+                    header=record_count == 0,
+                    index=False,
+                )
+            else:
+                table = pa.Table.from_pandas(batch_df, preserve_index=False)
+
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(output_path, table.schema)
+
+                parquet_writer.write_table(table)
 
-        if self.length_diff == -1:
-            self.length_dict = {k: length for length, k in value_lengths_key_array}
+            record_count += len(batch)
 
-            self.have_code_cols = self._elements_are_same(self.code_cols)
-            self.have_dra_cols = self._elements_are_same(self.dra_cols)
-            self.have_final_dra_cols = self._elements_are_same(self.final_dra_cols)
+            logger.debug("Wrote %s draw results to %s", record_count, output_path)
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
 
+    logger.info("Wrote %s draw results to %s", record_count, output_path)
+
+    return record_count
+
+
+def discover_draw_reports(pdf_directory: Path = DRAW_PDF_DIRECTORY) -> list[dict]:
+    """Finds the drawn out at reports in a directory and reads the species, year and
+    draw round from their names, e.g. "Drawn Out At Report 2024 Primary ELK.pdf".
+    Other PDFs are skipped.
+
+    :param pdf_directory: directory with the draw report PDFs
+
+    :return: dicts with the pdf_path, species, year and draw_round of each report
+    """
+    reports = []
+
+    for pdf_path in sorted(Path(pdf_directory).glob("*.pdf")):
+        match = DRAW_REPORT_NAME_PATTERN.fullmatch(pdf_path.name)
+
+        if match is None:
             logger.warning(
-                "Data lists are not the same length for hunt code: %s, code data=%s DRA data=%s final DRA data=%s. Page number: %s",
-                self.all_data_dict["hunt_code"][-1],
-                self.have_code_cols,
-                self.have_dra_cols,
-                self.have_final_dra_cols,
-                self.page_number,
+                "Skipping %s, it is not a drawn out at report", pdf_path.name
             )
 
-        elif self.length_diff < -1:
-            return ValueError(
-                f"Data lists have a difference greater than two. Most recent hunt code: {self.all_data_dict['hunt_code'][-1]}, data summary: {value_lengths_key_array}"
-            )
-        else:
-            self.have_code_cols = False
-            self.have_dra_cols = False
-            self.have_final_dra_cols = False
+            continue
 
-    def _parse_text(self):
-        for elt in self.draw_data:
-            elt = elt.strip().replace("\n", " ")
+        reports.append(
+            {
+                "pdf_path": pdf_path,
+                "species": match["species"].lower(),
+                "year": int(match["year"]),
+                "draw_round": match["draw_round"].lower(),
+            }
+        )
 
-            if elt.startswith(("EE", "EM", "EF", "EP")) and elt.endswith(
-                ("A", "B", "C")
-            ):
-                self._verify_value()
-                codes = elt.split(" ")
+    return reports
 
-                if self.have_code_cols:
-                    logger.info("Already have hunt code data for code: %s", codes[0])
 
-                    continue
+def draw_partition_path(report: dict, output_directory: Path) -> Path:
+    """Path of a report's file in the hive partitioned draw results dataset, e.g.
+    draw_results/species=elk/year=2024/draw_round=primary/draw_results.parquet
 
-                if len(codes) != 2:
-                    logger.info(
-                        codes, self.max_len, self.all_data_dict["hunt_code"][-1]
-                    )
-                    logger.info(elt)
-                    raise ValueError("List length is not 2")
+    :param report: item of discover_draw_reports
+    :param output_directory: root directory of the dataset
 
-                self.all_data_dict["hunt_code"].append(codes[0])
-                self.all_data_dict["list_code"].append(codes[1])
+    :return: path of the parquet file
+    """
+    partition_directory = Path(output_directory).joinpath(
+        *(f"{col}={report[col]}" for col in DRAW_PARTITION_COLS)
+    )
 
-            elif elt.startswith("DRA ") and "Report" not in elt:
-                if self.have_dra_cols:
-                    logger.info(
-                        "Already have DRA data for hunt code: %s",
-                        self.all_data_dict["hunt_code"][-1],
-                    )
-                    continue
+    return partition_directory / "draw_results.parquet"
 
-                draw_data_str = elt.split("DRA ")[1]
 
-                draw_out_data = [
-                    data_point
-                    for data_point in draw_data_str.split(" ")
-                    if data_point != ""
-                ]
+def parse_draw_report(report: dict, output_directory: Path) -> int:
+    """Streams one report into its partition of the draw results dataset. Runs in
+    the worker processes of build_draw_dataset, so only the record count is sent back.
 
-                if len(draw_out_data) != 6:
-                    logger.info(
-                        draw_out_data, self.max_len, self.all_data_dict["hunt_code"][-1]
-                    )
-                    logger.info(elt)
-                    raise ValueError("List length is not 6")
+    :param report: item of discover_draw_reports
+    :param output_directory: root directory of the dataset
 
-                self.all_data_dict["adult_res_draw_at"].append(draw_out_data[0])
-                self.all_data_dict["adult_nonrest_draw_at"].append(draw_out_data[1])
-                self.all_data_dict["youth_res_draw_at"].append(draw_out_data[2])
-                self.all_data_dict["youth_nonrest_draw_at"].append(draw_out_data[3])
-                self.all_data_dict["landowner_unrestr_draw_at"].append(draw_out_data[4])
-                self.all_data_dict["landowner_restr_draw_at"].append(draw_out_data[5])
+    :return: number of records written
+    """
+    output_path = draw_partition_path(report, output_directory)
 
-            elif elt.startswith("DAFL"):
-                final_data_str = elt.split("DAFL ")[1]
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-                final_data = [
-                    data_point
-                    for data_point in final_data_str.split(" ")
-                    if data_point != ""
-                ]
+    with PageTextCache() as cache:
+        reader = CachedPdfReader(
+            report["pdf_path"], PdfReader, f"pypdf-{pypdf.__version__}", cache=cache
+        )
 
-                if len(final_data) != 6:
-                    logger.info(
-                        final_data, self.max_len, self.all_data_dict["hunt_code"][-1]
-                    )
-                    logger.info(elt)
-                    raise ValueError("List length is not 6")
-
-                self.all_data_dict["final_adult_res_draw_at"].append(final_data[0])
-                self.all_data_dict["final_adult_nonrest_draw_at"].append(final_data[1])
-                self.all_data_dict["final_youth_res_draw_at"].append(final_data[2])
-                self.all_data_dict["final_youth_nonrest_draw_at"].append(final_data[3])
-                self.all_data_dict["final_landowner_unrestr_draw_at"].append(
-                    final_data[4]
-                )
-                self.all_data_dict["final_landowner_restr_draw_at"].append(
-                    final_data[5]
-                )
+        record_count = write_draw_results(
+            DrawReportParser(reader).iter_records(),
+            output_path,
+            drop_cols=[
+                col for col in DRAW_PARTITION_COLS if col in HUNT_CODE_POSITIONS
+            ],
+        )
 
-    def _add_cols(self):
-        condition = [
-            self.df.hunt_code.str.startswith("EE"),
-            self.df.hunt_code.str.startswith("EM"),
-            self.df.hunt_code.str.startswith("EF"),
-            self.df.hunt_code.str.startswith("EP"),
-        ]
+    if record_count == 0:
+        logger.warning("No draw results found in %s", report["pdf_path"])
 
-        choices = ["Either Sex", "Male", "Female", "Preference Point"]
+    return record_count
 
-        self.df["animal_sex"] = np.select(condition, choices, "uh oh")
 
-        self.df["gmu"] = self.df.hunt_code.str[2:5]
+def build_draw_dataset(
+    pdf_directory: Path = DRAW_PDF_DIRECTORY,
+    output_directory: Path = DRAW_DATASET_DIRECTORY,
+    workers: int = 1,
+) -> int:
+    """Parses every drawn out at report in pdf_directory into one parquet dataset
+    partitioned by species, year and draw round. When workers is greater than one
+    the reports are parsed in a process pool. The dataset is rebuilt from scratch
+    so reports that were removed drop out, page text comes from the page text cache.
+    It is written to a temporary sibling directory that replaces output_directory
+    only after every report parsed, a failed build keeps the previous dataset.
 
-        condition = [
-            self.df.hunt_code.str[-1] == "A",
-            self.df.hunt_code.str[-1] == "M",
-            self.df.hunt_code.str[-1] == "R",
-            self.df.hunt_code.str[-1] == "X",
-            self.df.hunt_code.str[-1] == "P",
-        ]
+    Example:
+    >>> build_draw_dataset(workers=4)
+    >>> pd.read_parquet(DRAW_DATASET_DIRECTORY, filters=[("species", "==", "elk")])
 
-        choices = ["Archery", "muzzleloader", "rifle", "season choice", "NA"]
+    :param pdf_directory: directory with the draw report PDFs
+    :param output_directory: root directory of the dataset
+    :param workers: number of processes used to parse the reports
 
-        self.df["method_of_take"] = np.select(condition, choices, "uh oh")
+    :return: number of records written
+    """
+    reports = discover_draw_reports(pdf_directory)
 
-    def pdf_to_csv(self):
-        for i, page in enumerate(self.reader.pages):
-            self.page_number = i
+    if not reports:
+        raise ValueError(
+            f"No drawn out at reports in {pdf_directory}, keeping {output_directory}"
+        )
 
-            text = page.extract_text()
+    output_directory = Path(output_directory)
+    output_directory.parent.mkdir(parents=True, exist_ok=True)
 
-            self.text_data = text
+    build_directory = Path(
+        tempfile.mkdtemp(
+            prefix=f".{output_directory.name}-", dir=output_directory.parent
+        )
+    )
 
-            self._clean_text()
+    output_directories = [build_directory] * len(reports)
 
-            self._parse_text()
+    try:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                record_counts = list(
+                    executor.map(parse_draw_report, reports, output_directories)
+                )
+        else:
+            record_counts = list(map(parse_draw_report, reports, output_directories))
+    except BaseException:
+        shutil.rmtree(build_directory, ignore_errors=True)
+        raise
 
-        self.df = pd.DataFrame(self.all_data_dict)
+    # Swap the new dataset in with renames, the old one is removed last
+    previous_directory = build_directory.with_name(f"{build_directory.name}-previous")
 
-        self._add_cols()
+    if output_directory.exists():
+        output_directory.rename(previous_directory)
 
+    build_directory.rename(output_directory)
 
-if __name__ == "__main__":
-    file_directory = Path(__file__).parent
+    shutil.rmtree(previous_directory, ignore_errors=True)
 
-    pdf_directory = (
-        file_directory.parent.parent.parent
-        / "pdf"
-        / "draw_result"
-        / "Drawn Out At Report 2024 Primary ELK.pdf"
+    logger.info(
+        "Wrote %s draw results from %s reports to %s",
+        sum(record_counts),
+        len(reports),
+        output_directory,
     )
 
-    reader = PdfReader(pdf_directory)
+    return sum(record_counts)
 
-    hunt_code_parser = DrawReportParser(reader)
 
-    hunt_code_parser.pdf_to_csv()
-
-    file_directory = file_directory.parent / "assets" / "data" / "draw_results.csv"
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Turns the drawn out at report PDFs into the draw_results dataset"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of processes used to parse the reports, defaults to 1 (serial)",
+    )
+    args = parser.parse_args()
 
-    hunt_code_parser.df.to_csv(file_directory, index=False)
+    build_draw_dataset(workers=args.workers)
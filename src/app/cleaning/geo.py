@@ -0,0 +1,190 @@
+"""
+Turns the CPW GMU boundaries into the GeoParquet file the app loads at startup.
+
+cpw_gmu.geojson -> cpw_gmu.parquet
+
+Renaming the columns, title casing the counties and simplifying the polygons
+used to run in every Streamlit process. Doing it here means get_geo_data only
+has to read a compact binary file.
+
+Every map zoom level in ZOOM_TOLERANCES gets its own geometry column, the map
+fetches the level for its zoom as a static GeoJSON file, see
+cache_state.get_geo_json. The GMUs are simplified together as a coverage, a border
+two units share is simplified once, so no gaps or overlaps open up between them.
+The coordinates of each level are then snapped to a grid, so they are written
+with only the digits the level needs.
+"""
+
+import sys
+import math
+import logging
+import argparse
+from pathlib import Path
+import numpy as np
+import shapely
+import geopandas as gpd
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s] [%(funcName)20s()] [%(levelname)s] - %(message)s",
+    stream=sys.stdout,
+)
+
+logger = logging.getLogger(__name__)
+
+DATA_DIRECTORY = Path(__file__).parent.parent / "assets" / "data"
+
+GMU_GEOJSON_PATH = DATA_DIRECTORY / "cpw_gmu.geojson"
+
+GMU_STORE_PATH = DATA_DIRECTORY / "cpw_gmu.parquet"
+
+# Map zoom -> coverage_simplify tolerance in degrees of the boundaries drawn at that
+# zoom. A 512 px Mapbox tile spans 360 / 2 ** zoom degrees. coverage_simplify moves
+# a border by about a third of the tolerance, so each level is off by about half a
+# pixel at its zoom and looks like the full detail boundaries there.
+ZOOM_TOLERANCES = {5: 0.03, 7: 0.008, 9: 0.003}
+
+# The first tolerance is used for the active geometry column, any others are
+# kept as extra geometry columns named geometry_<tolerance>.
+SIMPLIFY_TOLERANCES = (0.003, 0.008, 0.03)
+
+
+def quantize_grid(tolerance: float) -> float:
+    """Returns the grid the coordinates of a level are snapped to, the power of ten
+    at or below a tenth of its simplify tolerance. Snapping moves the borders much
+    less than simplifying did.
+
+    >>> quantize_grid(0.03), quantize_grid(0.008), quantize_grid(0.003)
+    (0.001, 0.0001, 0.0001)
+
+    :param tolerance: simplify tolerance of the level in degrees
+
+    :return: grid size in degrees
+    """
+    return 10.0 ** math.floor(math.log10(tolerance / 10))
+
+
+def simplify_coverage(
+    geometries: np.ndarray, tolerance: float, quantize: bool = True
+) -> np.ndarray:
+    """Simplifies the GMU polygons as a coverage and snaps their coordinates to
+    quantize_grid(tolerance). Borders two units share are identical before
+    snapping and so after it too.
+
+    :param geometries: GMU polygons
+    :param tolerance: simplify tolerance in degrees
+    :param quantize: snap the coordinates, off to compare payload sizes
+
+    :return: simplified polygons
+    """
+    simplified = shapely.coverage_simplify(geometries, tolerance)
+
+    if not quantize:
+        return simplified
+
+    return shapely.set_precision(simplified, quantize_grid(tolerance))
+
+
+def prepare_gmu_geometries(
+    gdf: gpd.GeoDataFrame,
+    tolerances: tuple[float, ...] = SIMPLIFY_TOLERANCES,
+    quantize: bool = True,
+) -> gpd.GeoDataFrame:
+    """Renames the GMU columns for display and simplifies the polygons, all with
+    vectorized GeoSeries/str methods. The polygons are simplified as a coverage
+    with shapely.coverage_simplify, borders stay shared as long as the GMUs in
+    the input do not overlap or leave slivers between them.
+
+    :param gdf: GMU boundaries as read from cpw_gmu.geojson
+    :param tolerances: simplify tolerances in degrees, see SIMPLIFY_TOLERANCES
+    :param quantize: snap the coordinates of each level, see simplify_coverage
+
+    :return: gdf for plotting on a map
+    """
+    gdf = gdf.rename(
+        columns={"GMUID": "GMU", "COUNTY": "County", "ELKDAU": "Elk DAU"},
+    )
+
+    gdf["County"] = gdf.County.str.title().str.split().str.join("/")
+
+    full_geometry = gdf.geometry.values
+
+    if not shapely.coverage_is_valid(full_geometry):
+        logger.warning(
+            "GMU boundaries overlap or have slivers, simplified borders may not match"
+        )
+
+    for tolerance in tolerances[1:]:
+        gdf[f"geometry_{tolerance}"] = gpd.GeoSeries(
+            simplify_coverage(full_geometry, tolerance, quantize),
+            index=gdf.index,
+            crs=gdf.crs,
+        )
+
+    gdf["geometry"] = simplify_coverage(full_geometry, tolerances[0], quantize)
+
+    return gdf
+
+
+def zoom_level_column(zoom: float) -> str:
+    """Returns the geometry column to draw at a map zoom, the coarsest level of
+    ZOOM_TOLERANCES that is still detailed enough for it.
+
+    >>> zoom_level_column(5), zoom_level_column(6), zoom_level_column(12)
+    ('geometry_0.03', 'geometry_0.008', 'geometry')
+
+    :param zoom: Mapbox zoom level, see cache_state.st_sidebar
+
+    :return: column of the gdf from prepare_gmu_geometries
+    """
+    level = min(
+        (level for level in ZOOM_TOLERANCES if level >= zoom),
+        default=max(ZOOM_TOLERANCES),
+    )
+
+    tolerance = ZOOM_TOLERANCES[level]
+
+    if tolerance == SIMPLIFY_TOLERANCES[0]:
+        return "geometry"
+
+    return f"geometry_{tolerance}"
+
+
+def build_geo_store(
+    geojson_path: Path = GMU_GEOJSON_PATH,
+    output_path: Path = GMU_STORE_PATH,
+    tolerances: tuple[float, ...] = SIMPLIFY_TOLERANCES,
+):
+    """Writes the prepared GMU boundaries as GeoParquet. Without the GeoJSON
+    nothing is written, get_geo_data then reads the GeoJSON at runtime.
+
+    :param geojson_path: CPW GMU boundaries
+    :param output_path: where to write the GeoParquet file
+    :param tolerances: simplify tolerances in degrees, see SIMPLIFY_TOLERANCES
+    """
+    if not Path(geojson_path).exists():
+        logger.warning("Skipping the geo store, %s does not exist", geojson_path)
+
+        return
+
+    gdf = prepare_gmu_geometries(gpd.read_file(geojson_path), tolerances)
+
+    gdf.to_parquet(output_path)
+
+    logger.info("Wrote %s GMUs to %s", len(gdf), output_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Turns cpw_gmu.geojson into cpw_gmu.parquet"
+    )
+    parser.add_argument(
+        "--tolerances",
+        type=float,
+        nargs="+",
+        default=SIMPLIFY_TOLERANCES,
+        help="simplify tolerances in degrees, the first one is the active geometry",
+    )
+    args = parser.parse_args()
+
+    build_geo_store(tolerances=tuple(args.tolerances))
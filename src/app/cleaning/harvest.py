@@ -9,17 +9,30 @@ Unit  Bulls Cows Calves Harvest Hunters Success Rec. Days
  691 0 9 2 11 81 14 295 
 
 Finish:
-    
+    unit,bulls,cows,calves,total_harvest,total_hunters,percent_success,total_rec_days,method_of_take,year
+    69,22,31,0,53,251,21,1041,rifle,2006
 
 """
 
 import os
+import re
 import sys
 import glob
+import json
 import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import PyPDF2
 from pathlib import Path
+from app.cleaning.page_cache import (
+    CachedPage,
+    CachedPdfReader,
+    PageTextCache,
+    extract_head_text,
+    file_sha256,
+)
+from app.cleaning.store import build_hunting_store
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,6 +42,22 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+PROJECT_DIRECTORY = Path(__file__).parent.parent.parent.parent
+
+HARVEST_PDF_DIRECTORY = PROJECT_DIRECTORY / "pdf" / "harvest"
+
+HUNTING_DATA_PATH = (
+    Path(__file__).parent.parent / "assets" / "data" / "hunting_data.csv"
+)
+
+HARVEST_SHARD_DIRECTORY = PROJECT_DIRECTORY / ".cache" / "harvest"
+
+# Bytes of each page's content stream read to find its section heading.
+PAGE_HEAD_BYTES = 4096
+
+# Bump when a change to the parsing code should invalidate every cached shard.
+SHARD_VERSION = 2
+
 
 def parse_rows(pdf_page_data: list) -> list[list[str]]:
     """Each PDF page has the data sperated by new lines. Once a page is split by
@@ -63,27 +92,164 @@ def parse_rows(pdf_page_data: list) -> list[list[str]]:
     return gmu_data
 
 
-def extract_archery_data(pdf_page: PyPDF2._page.PageObject):
-    page_text = pdf_page.extract_text().lower()
+def _spaced(text: str) -> str:
+    """Regex for text that matches no matter where the PDF put extra whitespace,
+    the reports have headings like "Elk Ha rvest" and "All Muzzl eloader"."""
+    return r"\s*".join(re.escape(char) for char in text if not char.isspace())
+
 
-    if (archery_str_index := page_text.find("archery")) != -1:
-        archery_page_section = page_text[archery_str_index::]
+# Heading above every table, the rest of the line names the table.
+TABLE_HEADING_PATTERN = re.compile(
+    _spaced("elk harvest, hunters and") + r"(?P<table>[^\n]*)", re.IGNORECASE
+)
 
-        archery_data = archery_page_section.split("\n")
+# method_of_take -> whitespace free, lower case name of its Recreation Days table.
+# Only these tables have the eight column layout parse_rows reads.
+HARVEST_SECTIONS = {
+    "archery": "recreationdaysforallarcheryseasons",
+    "muzzleloader": "recreationdaysforallmuzzleloaderseasons",
+    "rifle": "recreationdaysforallrifleseasons",
+    "all": "recreationdaysforallmannersoftake",
+}
+
+HARVEST_COLS = [
+    "unit",
+    "bulls",
+    "cows",
+    "calves",
+    "total_harvest",
+    "total_hunters",
+    "percent_success",
+    "total_rec_days",
+]
+
+
+def table_section(table: str) -> str | None:
+    """Returns the HARVEST_SECTIONS key of a table heading, or None for every
+    other table (single rifle seasons, late seasons, percent success ...).
 
-    else:
-        archery_data = None
+    Example:
+    >>> table_section(" Recreation Days for All Muzzl eloader Seasons ....... 42")
+    'muzzleloader'
+
+    :param table: text after "Elk Harvest, Hunters and" in a heading
+
+    :return: method of take of the table
+    """
+    table = re.sub(r"\s", "", table.lower())
+
+    for section, section_table in HARVEST_SECTIONS.items():
+        if table.startswith(section_table):
+            return section
+
+    return None
+
+
+def split_page_sections(
+    page_text: str, section: str | None = None
+) -> tuple[list[tuple[str, list[str]]], str | None]:
+    """Splits the text of a page at each table heading and sorts the lines under
+    a heading into that table's section. Text before the first heading continues
+    the table the previous page ended with.
+
+    Example:
+    >>> split_page_sections("2 1 0 0 1 3 33 9\\n2008 Elk Harvest, Hunters and Recreation Days for All Archery Seasons\\n1 1 0 0 1 6 17 29", "muzzleloader")
+    ([('muzzleloader', ['2 1 0 0 1 3 33 9', '2008 ']), ('archery', ['', '1 1 0 0 1 6 17 29'])], 'archery')
+
+    :param page_text: text of a harvest report page
+    :param section: section the previous page ended with
+
+    :return: (section, lines) for each wanted section on the page and the section
+        the page ends with
+    """
+    page_sections = []
+
+    start = 0
+    for heading in TABLE_HEADING_PATTERN.finditer(page_text):
+        if section is not None:
+            page_sections.append(
+                (section, page_text[start : heading.start()].split("\n"))
+            )
+
+        section = table_section(heading.group("table"))
+        start = heading.end()
+
+    if section is not None:
+        page_sections.append((section, page_text[start:].split("\n")))
+
+    return page_sections, section
+
+
+def page_head_text(pdf_page) -> str:
+    if isinstance(pdf_page, CachedPage):
+        return pdf_page.extract_head_text(PAGE_HEAD_BYTES)
+
+    return extract_head_text(pdf_page, PAGE_HEAD_BYTES)
+
+
+def head_section(head_text: str) -> str:
+    """Classifies a page by the heading at its top.
+
+    :param head_text: text at the top of a page, see page_head_text
+
+    :return: a HARVEST_SECTIONS key, "other" for a page with a heading of another
+        table or "unknown" when no heading could be read
+    """
+    if heading := TABLE_HEADING_PATTERN.search(head_text):
+        return table_section(heading.group("table")) or "other"
+
+    head_text = re.sub(r"\s", "", head_text.lower())
+
+    if "elkharvest" in head_text or "elkhunters" in head_text:
+        return "other"
+
+    return "unknown"
+
+
+def select_harvest_pages(pdf_reader) -> list[int]:
+    """Finds the pages that can hold data of a HARVEST_SECTIONS table by reading
+    only the heading at the top of each page. A page is kept when its heading is for
+    one of those tables, when it is right before such a page (the table can start
+    part way down it), or when no heading could be read. If no table heading is
+    found at all every page is kept, so an unknown report layout is parsed the slow
+    way instead of losing data.
+
+    Example:
+    >>> select_harvest_pages(PyPDF2.PdfReader("pdf/harvest/2006ElkHarvestSurvey.pdf"))
+    [0, 1, 2, 3, 4, 5, 6, 7, 32, 33, 34, 35, 36, 37, 38]
+
+    :param pdf_reader: PdfReader or CachedPdfReader of a harvest report
+
+    :return: indexes of the pages that need a full text extraction
+    """
+    page_sections = [
+        head_section(page_head_text(pdf_page)) for pdf_page in pdf_reader.pages
+    ]
 
-    return archery_data
+    if not set(page_sections) & set(HARVEST_SECTIONS):
+        return list(range(len(page_sections)))
 
+    selected_pages = []
+    for i, section in enumerate(page_sections):
+        next_section = page_sections[i + 1] if i + 1 < len(page_sections) else None
 
-def parse_pdf_archery_data(pdf_reader) -> pd.DataFrame:
+        if section != "other" or next_section in HARVEST_SECTIONS:
+            selected_pages.append(i)
+
+    return selected_pages
+
+
+def parse_pdf_harvest_data(pdf_reader, select_pages: bool = True) -> pd.DataFrame:
     """The data is in a table format within the pdf and each row in
     the table represents a game unit. The rows come in a patter of eight
     different numbers that are the values for 8 different columns. If a row
     is parsed and does not have 8 different numbers then it is not the data
     we are looking for.
 
+    Every page is extracted once and its rows are sorted into the archery,
+    muzzleloader, all rifle seasons and all manners of take tables by the
+    headings above them, see split_page_sections.
+
     Sample Page:
         2006 Elk Harvest, Hunters and Recreation Days for All Rifle Seasons
         Total Total Percent Total
@@ -93,58 +259,212 @@ def parse_pdf_archery_data(pdf_reader) -> pd.DataFrame:
     691 0 9 2 11 81 14 295
 
     :param pdf: a pdf of the hunting data from CPW
+    :param select_pages: only extract the pages found by select_harvest_pages
 
-    :return: pdf data as a pandas dataframe.
+    :return: pdf data as a long pandas dataframe with a method_of_take column
     """
-    all_rows = []
-    for pdf_page in pdf_reader.pages:
-        archery_data = extract_archery_data(pdf_page)
-
-        if archery_data:
-            all_rows += parse_rows(archery_data)
-
-    archery_df = pd.DataFrame(
-        data=all_rows,
-        columns=[
-            "unit",
-            "bulls",
-            "cows",
-            "calves",
-            "total_harvest",
-            "total_hunters",
-            "percent_success",
-            "total_rec_days",
+    if select_pages:
+        page_indexes = select_harvest_pages(pdf_reader)
+    else:
+        page_indexes = range(len(pdf_reader.pages))
+
+    section_rows = {section: [] for section in HARVEST_SECTIONS}
+
+    section, previous_index = None, None
+    for page_index in page_indexes:
+        if page_index - 1 != previous_index:
+            section = None
+
+        page_text = pdf_reader.pages[page_index].extract_text().lower()
+
+        page_sections, section = split_page_sections(page_text, section)
+
+        for page_section, lines in page_sections:
+            section_rows[page_section] += parse_rows(lines)
+
+        previous_index = page_index
+
+    harvest_df = pd.concat(
+        [
+            pd.DataFrame(data=rows, columns=HARVEST_COLS)
+            .astype(int)
+            .assign(method_of_take=section)
+            for section, rows in section_rows.items()
         ],
-    ).astype(int)
+        ignore_index=True,
+    )
 
-    return archery_df
+    return harvest_df
 
 
-def pdf_to_csv():
-    file_directory = Path(__file__).parent
+def parse_harvest_pdf(pdf_file: str) -> pd.DataFrame:
+    """Parses a single yearly harvest report. The year is taken from the first
+    four characters of the file name, e.g. 2006ElkHarvestSurvey.pdf.
 
-    pdf_directory = file_directory.parent / "pdf" / "harvest"
+    This is a module level function so it can be sent to a process pool.
 
-    pdf_files = glob.glob(os.path.join(pdf_directory, "*.pdf"))
+    :param pdf_file: path to a harvest report PDF
 
-    all_data = []
-    for pdf_file in pdf_files:
-        logger.info("Processing file %s: ", pdf_file)
+    :return: harvest data for the report with a year column
+    """
+    logger.info("Processing file %s: ", pdf_file)
+
+    with PageTextCache() as cache:
+        reader = CachedPdfReader(
+            pdf_file, PyPDF2.PdfReader, f"PyPDF2-{PyPDF2.__version__}", cache=cache
+        )
+
+        df = parse_pdf_harvest_data(reader)
+
+    df["year"] = int(Path(pdf_file).name[0:4])
+
+    logger.info("Number of rows found %s: ", len(df))
+
+    return df
+
+
+def parse_harvest_pdfs(pdf_files: list[str], workers: int = 1) -> list[pd.DataFrame]:
+    """Parses every harvest report. When workers is greater than one the files
+    are parsed in a process pool. The DataFrames are always returned in the
+    order of pdf_files so the result does not depend on which worker finishes first.
+
+    :param pdf_files: paths to the harvest report PDFs
+    :param workers: number of processes used to parse the reports
+
+    :return: harvest data for each report
+    """
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(parse_harvest_pdf, pdf_files))
 
-        reader = PyPDF2.PdfReader(pdf_file)
+    return [parse_harvest_pdf(pdf_file) for pdf_file in pdf_files]
 
-        df = parse_pdf_archery_data(reader)
 
-        year = pdf_file.split("\\")[-1][0:4]
+def update_harvest_shards(
+    pdf_files: list[str],
+    shard_directory: Path = HARVEST_SHARD_DIRECTORY,
+    workers: int = 1,
+    rebuild: bool = False,
+) -> list[Path]:
+    """Keeps one parsed CSV shard per harvest report in shard_directory. A
+    manifest.json records the content hash each shard was built from, so only
+    new or changed reports are parsed again. Shards of reports that are no
+    longer in pdf_files are removed.
 
-        df["year"] = int(year)
+    Manifest, version is the SHARD_VERSION the shards were parsed with:
+        {"version": 2, "files": {"2006ElkHarvestSurvey.pdf": {"sha256": "...", "shard": "2006ElkHarvestSurvey.csv"}}}
+
+    :param pdf_files: paths to the harvest report PDFs
+    :param shard_directory: directory for the shards and the manifest
+    :param workers: number of processes used to parse the changed reports
+    :param rebuild: ignore the manifest and parse every report
+
+    :return: shard paths in the order of pdf_files
+    """
+    shard_directory.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = shard_directory / "manifest.json"
+
+    manifest = {"version": SHARD_VERSION, "files": {}}
+
+    if manifest_path.exists() and not rebuild:
+        with open(manifest_path, "r") as file:
+            saved_manifest = json.load(file)
+
+        if saved_manifest.get("version") == SHARD_VERSION:
+            manifest = saved_manifest
+
+    file_hashes = {pdf_file: file_sha256(pdf_file) for pdf_file in pdf_files}
+
+    stale_files = []
+    for pdf_file, sha256 in file_hashes.items():
+        entry = manifest["files"].get(Path(pdf_file).name)
+
+        if (
+            entry is None
+            or entry["sha256"] != sha256
+            or not (shard_directory / entry["shard"]).exists()
+        ):
+            stale_files.append(pdf_file)
+
+    logger.info(
+        "%s of %s harvest reports need to be parsed", len(stale_files), len(pdf_files)
+    )
+
+    for pdf_file, df in zip(stale_files, parse_harvest_pdfs(stale_files, workers)):
+        shard_name = f"{Path(pdf_file).stem}.csv"
+
+        df.to_csv(shard_directory / shard_name, index=False)
+
+        manifest["files"][Path(pdf_file).name] = {
+            "sha256": file_hashes[pdf_file],
+            "shard": shard_name,
+        }
+
+    current_names = {Path(pdf_file).name for pdf_file in pdf_files}
+
+    for name in list(manifest["files"]):
+        if name not in current_names:
+            (shard_directory / manifest["files"].pop(name)["shard"]).unlink(
+                missing_ok=True
+            )
+
+    with open(manifest_path, "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+
+    return [
+        shard_directory / manifest["files"][Path(pdf_file).name]["shard"]
+        for pdf_file in pdf_files
+    ]
+
+
+def pdf_to_csv(
+    workers: int = 1,
+    pdf_directory: Path = HARVEST_PDF_DIRECTORY,
+    output_path: Path = HUNTING_DATA_PATH,
+    shard_directory: Path = HARVEST_SHARD_DIRECTORY,
+    rebuild: bool = False,
+):
+    """Turns every harvest report in pdf_directory into a single long format CSV
+    file with a row per unit, method_of_take and year. The reports are sorted by
+    file name (and so by year), only new or changed reports are parsed and the
+    cached shards are stacked in that order. The output is the same for any number
+    of workers.
+
+    :param workers: number of processes used to parse the reports
+    :param pdf_directory: directory with the harvest report PDFs
+    :param output_path: where to write the CSV file
+    :param shard_directory: directory for the per report shards
+    :param rebuild: parse every report even if its shard is up to date
+    """
+    pdf_files = sorted(glob.glob(os.path.join(pdf_directory, "*.pdf")))
 
-        all_data.append(df)
+    shard_paths = update_harvest_shards(
+        pdf_files, shard_directory, workers=workers, rebuild=rebuild
+    )
 
-        logger.info("Number of GMUs found %s: ", len(df))
+    df = pd.concat([pd.read_csv(shard_path) for shard_path in shard_paths])
 
-    pd.concat(all_data).to_csv("data//hunting_data.csv", index=False)
+    df.to_csv(output_path, index=False)
 
 
 if __name__ == "__main__":
-    pdf_to_csv()
+    parser = argparse.ArgumentParser(
+        description="Turns the harvest report PDFs into hunting_data.csv"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of processes used to parse the reports, defaults to 1 (serial)",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="parse every report instead of only new or changed ones",
+    )
+    args = parser.parse_args()
+
+    pdf_to_csv(workers=args.workers, rebuild=args.rebuild)
+
+    build_hunting_store()
@@ -2,6 +2,7 @@ import json
 from pathlib import Path
 import pandas as pd
 import geopandas as gpd
+from app.cleaning.store import build_hunting_store
 
 
 def load_otc_data(otc_dict: dict, gdf: gpd.GeoDataFrame) -> pd.DataFrame:
@@ -69,3 +70,5 @@ if __name__ == "__main__":
     fpath = data_directory / "otc.csv"
 
     df.to_csv(fpath, index=False)
+
+    build_hunting_store()
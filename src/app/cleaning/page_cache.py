@@ -0,0 +1,328 @@
+"""
+On disk cache of the text extracted from PDF pages. Text extraction is the
+slowest step when turning the CPW reports into CSV files, so the harvest and
+draw parsers read pages through CachedPdfReader and only pay for it once per
+(PDF hash, page index, extractor version).
+
+The cache is a SQLite file, when it grows past max_bytes the least recently
+used pages are evicted.
+"""
+
+import time
+import sqlite3
+import hashlib
+from pathlib import Path
+from PyPDF2.generic import DecodedStreamObject, NameObject
+
+PROJECT_DIRECTORY = Path(__file__).parent.parent.parent.parent
+
+PAGE_CACHE_PATH = PROJECT_DIRECTORY / ".cache" / "page_text.sqlite"
+
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def file_sha256(fpath: str | Path) -> str:
+    """Hashes the contents of a file, so a report replaced under the same name is
+    parsed again and the page text cache is keyed by content instead of path.
+
+    :param fpath: path to the file
+
+    :return: hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+
+    with open(fpath, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def extract_head_text(pdf_page, head_bytes: int) -> str:
+    """Extracts the text from only the first head_bytes of a page's content stream,
+    cut at the end of the last complete text object. Reports write the page
+    number and section title first, so this reads the heading of a page for a
+    fraction of the cost of extract_text.
+
+    :param pdf_page: PyPDF2 PageObject
+    :param head_bytes: number of content stream bytes to read
+
+    :return: text at the top of the page, empty if it could not be extracted
+    """
+    try:
+        contents = pdf_page.get("/Contents")
+
+        if contents is None:
+            return ""
+
+        contents = contents.get_object()
+
+        if isinstance(contents, list):
+            data = b"".join(stream.get_object().get_data() for stream in contents)
+        else:
+            data = contents.get_data()
+
+        head_data = data[:head_bytes]
+
+        text_object_end = head_data.rfind(b"ET")
+
+        # Without a complete text object in the head, read the whole head
+        if text_object_end != -1:
+            head_data = head_data[: text_object_end + 2]
+
+        head_stream = DecodedStreamObject()
+        head_stream.set_data(head_data)
+
+        head_page = type(pdf_page)(pdf_page.pdf)
+        head_page.update(pdf_page)
+        head_page[NameObject("/Contents")] = head_stream
+
+        return head_page.extract_text()
+    except Exception:  # pylint: disable=broad-except
+        # A page without content, or a cut stream that ends inside a graphics
+        # state the extractor chokes on. Callers treat an empty head as unknown
+        # and fall back to extract_text.
+        return ""
+
+
+class PageTextCache:
+    """SQLite backed page text cache. Close it when done, or use it as a context
+    manager.
+
+    Example:
+    >>> with PageTextCache() as cache:
+    ...     reader = CachedPdfReader(pdf_file, PyPDF2.PdfReader, "PyPDF2-3.0.1", cache=cache)
+
+    :param path: SQLite file
+    :param max_bytes: size of the page text above which pages are evicted
+    """
+
+    def __init__(self, path: Path = PAGE_CACHE_PATH, max_bytes: int = MAX_CACHE_BYTES):
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS page_text (
+                pdf_hash TEXT,
+                page_index INTEGER,
+                extractor_version TEXT,
+                text TEXT,
+                size INTEGER,
+                last_used REAL,
+                PRIMARY KEY (pdf_hash, page_index, extractor_version)
+            );
+            CREATE INDEX IF NOT EXISTS page_text_last_used ON page_text (last_used);
+            CREATE TABLE IF NOT EXISTS page_count (
+                pdf_hash TEXT PRIMARY KEY,
+                page_count INTEGER
+            );
+            """
+        )
+
+        # Running size of the page text, so put does not sum the table. Pages
+        # written by other processes are counted the next time evict runs.
+        self.total_bytes = self._stored_bytes()
+
+    def __enter__(self) -> "PageTextCache":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _stored_bytes(self) -> int:
+        (total_bytes,) = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM page_text"
+        ).fetchone()
+
+        return total_bytes
+
+    def get(self, pdf_hash: str, page_index: int, extractor_version: str) -> str | None:
+        """Returns the cached text of a page or None if it is not cached."""
+        key = (pdf_hash, page_index, extractor_version)
+
+        row = self.connection.execute(
+            "SELECT text FROM page_text WHERE pdf_hash=? AND page_index=? AND extractor_version=?",
+            key,
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        with self.connection:
+            self.connection.execute(
+                "UPDATE page_text SET last_used=? WHERE pdf_hash=? AND page_index=? AND extractor_version=?",
+                (time.time(), *key),
+            )
+
+        return row[0]
+
+    def put(self, pdf_hash: str, page_index: int, extractor_version: str, text: str):
+        """Stores the text of a page and evicts the least recently used pages if
+        the cache is larger than max_bytes."""
+        key = (pdf_hash, page_index, extractor_version)
+
+        size = len(text.encode())
+
+        with self.connection:
+            replaced = self.connection.execute(
+                "SELECT size FROM page_text WHERE pdf_hash=? AND page_index=? AND extractor_version=?",
+                key,
+            ).fetchone()
+
+            self.connection.execute(
+                "INSERT OR REPLACE INTO page_text VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, text, size, time.time()),
+            )
+
+        self.total_bytes += size - (replaced[0] if replaced else 0)
+
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Deletes the least recently used pages until the cache fits in max_bytes."""
+        total_bytes = self._stored_bytes()
+
+        if total_bytes <= self.max_bytes:
+            self.total_bytes = total_bytes
+            return
+
+        rows = self.connection.execute(
+            "SELECT rowid, size FROM page_text ORDER BY last_used"
+        ).fetchall()
+
+        evicted = []
+        for rowid, size in rows:
+            if total_bytes <= self.max_bytes:
+                break
+
+            evicted.append((rowid,))
+            total_bytes -= size
+
+        with self.connection:
+            self.connection.executemany("DELETE FROM page_text WHERE rowid=?", evicted)
+
+        self.total_bytes = total_bytes
+
+    def get_page_count(self, pdf_hash: str) -> int | None:
+        row = self.connection.execute(
+            "SELECT page_count FROM page_count WHERE pdf_hash=?", (pdf_hash,)
+        ).fetchone()
+
+        return None if row is None else row[0]
+
+    def put_page_count(self, pdf_hash: str, page_count: int):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO page_count VALUES (?, ?)",
+                (pdf_hash, page_count),
+            )
+
+    def close(self):
+        self.connection.close()
+
+
+class CachedPage:
+    def __init__(self, cached_reader: "CachedPdfReader", page_index: int):
+        self.cached_reader = cached_reader
+        self.page_index = page_index
+
+    def extract_text(self) -> str:
+        """Same as PageObject.extract_text but reads through the page text cache."""
+        return self.cached_reader.extract_page_text(self.page_index)
+
+    def extract_head_text(self, head_bytes: int) -> str:
+        """Same as extract_head_text but reads through the page text cache."""
+        return self.cached_reader.extract_page_text(self.page_index, head_bytes)
+
+
+class CachedPdfReader:
+    """Stands in for a PdfReader in the parsers, which only iterate over pages
+    and call extract_text. The PDF is only opened when a page is missing from
+    the cache, so re-running a parser on cached reports never touches PyPDF2/pypdf.
+
+    Example:
+    >>> reader = CachedPdfReader("2006ElkHarvestSurvey.pdf", PyPDF2.PdfReader, "PyPDF2-3.0.1")
+    >>> reader.pages[33].extract_text()
+    '2006 Elk Harvest, Hunters and Recreation Days for All Archery Seasons ...'
+
+    :param pdf_path: path to the PDF file
+    :param reader_class: PdfReader class used when a page is not cached
+    :param extractor_version: cache key for the extraction code, change it when
+        the PDF library or the way text is extracted changes
+    :param cache: page text cache, defaults to the shared cache in .cache/
+    """
+
+    def __init__(
+        self,
+        pdf_path: str | Path,
+        reader_class,
+        extractor_version: str,
+        cache: PageTextCache | None = None,
+    ):
+        self.pdf_path = pdf_path
+        self.reader_class = reader_class
+        self.extractor_version = extractor_version
+        self._cache = cache
+        self._pdf_hash = None
+        self._reader = None
+        self._pages = None
+
+    @property
+    def cache(self) -> PageTextCache:
+        if self._cache is None:
+            self._cache = PageTextCache()
+
+        return self._cache
+
+    @property
+    def pdf_hash(self) -> str:
+        if self._pdf_hash is None:
+            self._pdf_hash = file_sha256(self.pdf_path)
+
+        return self._pdf_hash
+
+    @property
+    def reader(self):
+        if self._reader is None:
+            self._reader = self.reader_class(self.pdf_path)
+
+        return self._reader
+
+    @property
+    def pages(self) -> list[CachedPage]:
+        if self._pages is None:
+            page_count = self.cache.get_page_count(self.pdf_hash)
+
+            if page_count is None:
+                page_count = len(self.reader.pages)
+
+                self.cache.put_page_count(self.pdf_hash, page_count)
+
+            self._pages = [CachedPage(self, i) for i in range(page_count)]
+
+        return self._pages
+
+    def extract_page_text(self, page_index: int, head_bytes: int | None = None) -> str:
+        if head_bytes is None:
+            extractor_version = self.extractor_version
+        else:
+            extractor_version = f"{self.extractor_version}-head{head_bytes}"
+
+        text = self.cache.get(self.pdf_hash, page_index, extractor_version)
+
+        if text is None:
+            pdf_page = self.reader.pages[page_index]
+
+            if head_bytes is None:
+                text = pdf_page.extract_text()
+            else:
+                text = extract_head_text(pdf_page, head_bytes)
+
+            self.cache.put(self.pdf_hash, page_index, extractor_version, text)
+
+        return text
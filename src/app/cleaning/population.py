@@ -0,0 +1,223 @@
+""" Turns the post hunt population estimate PDFs into CSV files
+
+Start:
+    2023 POST HUNT POPULATION & SEX RATIO ESTIMATES
+DAU* Herd Name GAME MANAGEMENT UNITES INVOLVED IN 2023 Post Hunt Estimate Bull/Cow ratio (per 100)
+01   Cold Springs   2, 201                             1,500   78
+ ...
+55   Northern San Luis Valley Floor   682, 791           150   14
+
+Finish:
+    population_estimates.csv
+    year,dau,herd_name,units,post_hunt_estimate,bull_cow_ratio
+    2023,1,Cold Springs,"2, 201",1500,78
+
+    dau_harvest.csv, the estimates joined with the harvest of the DAU's units
+    year,dau,herd_name,units,post_hunt_estimate,bull_cow_ratio,dau_harvest,dau_hunters,harvest_population_ratio,hunters_per_1000_elk
+    2023,1,Cold Springs,"2, 201",1500,78,196,357,0.131,238.0
+"""
+
+import os
+import re
+import sys
+import glob
+import logging
+from pathlib import Path
+import pandas as pd
+from pypdf import PdfReader
+from app.cleaning.store import build_hunting_store
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s] [%(funcName)20s()] [%(levelname)s] - %(message)s",
+    stream=sys.stdout,
+)
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIRECTORY = Path(__file__).parent.parent.parent.parent
+
+POPULATION_PDF_DIRECTORY = PROJECT_DIRECTORY / "pdf" / "pop_estimation"
+
+DATA_DIRECTORY = Path(__file__).parent.parent / "assets" / "data"
+
+POPULATION_DATA_PATH = DATA_DIRECTORY / "population_estimates.csv"
+
+DAU_HARVEST_PATH = DATA_DIRECTORY / "dau_harvest.csv"
+
+# Harvest compared with the herd size, every manner of take counts against a herd.
+DAU_METHOD_OF_TAKE = "all"
+
+# A table row in the layout extraction, columns are at least two spaces apart. The
+# herd name column was added in 2021.
+POPULATION_ROW_PATTERN = re.compile(
+    r"^\s*(?P<dau>\d{1,2})\s{2,}"
+    r"(?:(?P<herd_name>[^\d\s].*?)\s{2,})?"
+    r"(?P<units>\d{1,3}(?:,\s*\d{1,3})*)\s{2,}"
+    r"(?P<post_hunt_estimate>\d{1,3}(?:,\d{3})*)\s{2,}"
+    r"(?P<bull_cow_ratio>\d{1,3})\s*$",
+    re.MULTILINE,
+)
+
+POPULATION_COLS = [
+    "year",
+    "dau",
+    "herd_name",
+    "units",
+    "post_hunt_estimate",
+    "bull_cow_ratio",
+]
+
+
+def parse_population_rows(page_text: str) -> list[dict]:
+    """Finds the DAU rows in the layout text of a population estimate report. Rows
+    without an estimate, like the eastern plains units that are not in a DAU and
+    the statewide total, are skipped.
+
+    Example:
+    >>> parse_population_rows("01   Cold Springs   2, 201       1,500     78")
+    [{'dau': 1, 'herd_name': 'Cold Springs', 'units': '2, 201', 'post_hunt_estimate': 1500, 'bull_cow_ratio': 78}]
+
+    :param page_text: text of the page extracted with extraction_mode="layout"
+
+    :return: a dict per DAU
+    """
+    rows = []
+    for match in POPULATION_ROW_PATTERN.finditer(page_text):
+        rows.append(
+            {
+                "dau": int(match.group("dau")),
+                "herd_name": match.group("herd_name"),
+                "units": re.sub(r",\s*", ", ", match.group("units")),
+                "post_hunt_estimate": int(
+                    match.group("post_hunt_estimate").replace(",", "")
+                ),
+                "bull_cow_ratio": int(match.group("bull_cow_ratio")),
+            }
+        )
+
+    return rows
+
+
+def parse_population_pdf(pdf_file: str) -> pd.DataFrame:
+    """Parses a single yearly population estimate report. The year is taken from
+    the first four characters of the file name, e.g. 2023ElkPopulationEstimates.pdf.
+
+    The columns are told apart by the whitespace between them, so the text is
+    extracted in layout mode, plain extraction glues the last unit of a row to its
+    estimate. Reports that only have glyphs and no text layer (the 2022 report
+    draws its text with a Type3 font without a ToUnicode map) give no rows and
+    are logged.
+
+    :param pdf_file: path to a population estimate report PDF
+
+    :return: estimates for the report with a year column
+    """
+    logger.info("Processing file %s: ", pdf_file)
+
+    reader = PdfReader(pdf_file)
+
+    rows = []
+    for pdf_page in reader.pages:
+        rows += parse_population_rows(pdf_page.extract_text(extraction_mode="layout"))
+
+    if not rows:
+        logger.warning(
+            "No DAU rows found in %s, it may not have a text layer", pdf_file
+        )
+
+    df = pd.DataFrame(data=rows, columns=POPULATION_COLS[1:]).astype(
+        {"dau": int, "post_hunt_estimate": int, "bull_cow_ratio": int}
+    )
+
+    df.insert(0, "year", int(Path(pdf_file).name[0:4]))
+
+    logger.info("Number of DAUs found %s: ", len(df))
+
+    return df
+
+
+def summarize_dau_harvest(
+    population_df: pd.DataFrame,
+    harvest_df: pd.DataFrame,
+    method_of_take: str = DAU_METHOD_OF_TAKE,
+) -> pd.DataFrame:
+    """Adds the harvest and hunters of every unit in a DAU to its population
+    estimate for the same year. Units are matched with the DAU's unit list from
+    the report of that year, so DAU boundary changes between years are kept.
+
+    :param population_df: data from population_estimates.csv
+    :param harvest_df: data from hunting_data.csv
+    :param method_of_take: harvest rows to add up, see harvest.HARVEST_SECTIONS
+
+    :return: population_df with dau_harvest, dau_hunters, harvest_population_ratio
+        and hunters_per_1000_elk columns
+    """
+    unit_df = (
+        population_df[["year", "dau", "units"]]
+        .assign(unit=population_df.units.str.split(", "))
+        .explode("unit")
+        .astype({"unit": int})
+    )
+
+    harvest_df = harvest_df.loc[
+        harvest_df.method_of_take == method_of_take,
+        ["year", "unit", "total_harvest", "total_hunters"],
+    ]
+
+    dau_totals = (
+        unit_df.merge(harvest_df, on=["year", "unit"], how="inner")
+        .groupby(["year", "dau"], as_index=False)[["total_harvest", "total_hunters"]]
+        .sum()
+        .rename(
+            columns={"total_harvest": "dau_harvest", "total_hunters": "dau_hunters"}
+        )
+    )
+
+    dau_df = population_df.merge(dau_totals, on=["year", "dau"], how="left").astype(
+        {"dau_harvest": "Int64", "dau_hunters": "Int64"}
+    )
+
+    dau_df["harvest_population_ratio"] = (
+        dau_df.dau_harvest / dau_df.post_hunt_estimate
+    ).round(3)
+
+    dau_df["hunters_per_1000_elk"] = (
+        dau_df.dau_hunters / dau_df.post_hunt_estimate * 1000
+    ).round(1)
+
+    return dau_df
+
+
+def pdf_to_csv(
+    pdf_directory: Path = POPULATION_PDF_DIRECTORY,
+    harvest_path: Path = DATA_DIRECTORY / "hunting_data.csv",
+    population_path: Path = POPULATION_DATA_PATH,
+    dau_harvest_path: Path = DAU_HARVEST_PATH,
+):
+    """Turns every population estimate report in pdf_directory into
+    population_estimates.csv and joins it with the harvest data into
+    dau_harvest.csv, which app.cleaning.store adds to the unit data the app loads.
+
+    :param pdf_directory: directory with the population estimate PDFs
+    :param harvest_path: long format harvest data, see app.cleaning.harvest
+    :param population_path: where to write the estimates
+    :param dau_harvest_path: where to write the DAU table
+    """
+    pdf_files = sorted(glob.glob(os.path.join(pdf_directory, "*.pdf")))
+
+    population_df = pd.concat(
+        [parse_population_pdf(pdf_file) for pdf_file in pdf_files], ignore_index=True
+    )
+
+    population_df.to_csv(population_path, index=False)
+
+    dau_df = summarize_dau_harvest(population_df, pd.read_csv(harvest_path))
+
+    dau_df.to_csv(dau_harvest_path, index=False)
+
+
+if __name__ == "__main__":
+    pdf_to_csv()
+
+    build_hunting_store()
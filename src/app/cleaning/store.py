@@ -0,0 +1,147 @@
+"""
+Joins the cleaned CSV files into the typed, columnar file the app loads at startup.
+
+hunting_data.csv + otc.csv + dau_harvest.csv -> hunting_data.feather
+
+The join, null filling and column renaming used to run in every Streamlit
+process. Doing it here means a cold start only has to read one small Arrow
+file.
+"""
+
+import sys
+import logging
+from pathlib import Path
+import pandas as pd
+import pyarrow.feather as feather
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s] [%(funcName)20s()] [%(levelname)s] - %(message)s",
+    stream=sys.stdout,
+)
+
+logger = logging.getLogger(__name__)
+
+DATA_DIRECTORY = Path(__file__).parent.parent / "assets" / "data"
+
+HUNTING_STORE_PATH = DATA_DIRECTORY / "hunting_data.feather"
+
+OTC_COLS = [
+    "private_either_sex",
+    "private_female",
+    "public_either_sex",
+    "public_female",
+]
+
+# hunting_data.csv has every manner of take, the app shows archery harvest.
+STORE_METHOD_OF_TAKE = "archery"
+
+# Metrics of the DAU (Data Analysis Unit) a unit was in, see app.cleaning.population
+DAU_COLS = [
+    "post_hunt_estimate",
+    "bull_cow_ratio",
+    "harvest_population_ratio",
+    "hunters_per_1000_elk",
+]
+
+HUNTING_DTYPES = {
+    "Year": "int16",
+    "Bulls": "int16",
+    "Cows": "int16",
+    "Calves": "int16",
+    "Total Harvest": "int16",
+    "Total Hunters": "int32",
+    "Percent Success": "int16",
+    "Total Rec Days": "int32",
+    "Private Either Sex": "bool",
+    "Private Female": "bool",
+    "Public Either Sex": "bool",
+    "Public Female": "bool",
+    "No Over The Counter": "bool",
+    "Post Hunt Estimate": "float32",
+    "Bull Cow Ratio": "float32",
+    "Harvest Population Ratio": "float32",
+    "Hunters Per 1000 Elk": "float32",
+}
+
+
+def join_hunting_data(
+    hunt_df: pd.DataFrame, otc_df: pd.DataFrame, dau_df: pd.DataFrame | None = None
+) -> pd.DataFrame:
+    """Adds the OTC columns and the DAU_COLS of the DAU each unit was in that year to
+    the harvest data, titles the column names for display and sets compact dtypes.
+    Unit is categorical since it is only ever used as a label or filter value.
+    The DAU columns are NaN for years without a population estimate. Raises
+    pd.errors.MergeError if dau_df lists a unit under two DAUs in the same year.
+
+    :param hunt_df: data from hunting_data.csv
+    :param otc_df: data from otc.csv
+    :param dau_df: data from dau_harvest.csv
+
+    :return: df the app plots from
+    """
+    df = hunt_df.merge(otc_df.rename(columns={"GMUID": "unit"}), on="unit", how="left")
+
+    if dau_df is None:
+        dau_df = pd.DataFrame(columns=["year", "units"] + DAU_COLS)
+
+    unit_dau_df = (
+        dau_df.assign(unit=dau_df.units.str.split(", "))
+        .explode("unit")
+        .astype({"unit": "int64", "year": "int64"})[["year", "unit"] + DAU_COLS]
+    )
+
+    # A unit listed under two DAUs in a year would duplicate its harvest rows
+    df = df.merge(unit_dau_df, on=["year", "unit"], how="left", validate="many_to_one")
+
+    df[OTC_COLS] = df[OTC_COLS].astype("boolean").fillna(False).astype(bool)
+
+    # Units missing from otc.csv have no over the counter licenses
+    df["no_over_the_counter"] = (
+        df["no_over_the_counter"]
+        .astype("boolean")
+        .fillna(~df[OTC_COLS].any(axis=1))
+        .astype(bool)
+    )
+
+    df.columns = [col.replace("_", " ").title() for col in df.columns]
+
+    df = df.astype(HUNTING_DTYPES)
+
+    df["Unit"] = df["Unit"].astype("int16").astype("category")
+
+    return df
+
+
+def build_hunting_store(
+    data_directory: Path = DATA_DIRECTORY, output_path: Path = HUNTING_STORE_PATH
+):
+    """Writes the joined hunting data as an uncompressed Feather (Arrow IPC) file
+    for get_hunting_data. Only the STORE_METHOD_OF_TAKE rows
+    of hunting_data.csv are kept.
+
+    :param data_directory: directory with hunting_data.csv, otc.csv and
+        optionally dau_harvest.csv
+    :param output_path: where to write the Feather file
+    """
+    hunt_df = pd.read_csv(data_directory / "hunting_data.csv")
+
+    hunt_df = hunt_df.loc[hunt_df.method_of_take == STORE_METHOD_OF_TAKE].drop(
+        columns="method_of_take"
+    )
+
+    otc_df = pd.read_csv(data_directory / "otc.csv")
+
+    dau_df = None
+    if (data_directory / "dau_harvest.csv").exists():
+        dau_df = pd.read_csv(data_directory / "dau_harvest.csv")
+
+    df = join_hunting_data(hunt_df, otc_df, dau_df)
+
+    feather.write_feather(df, output_path, compression="uncompressed")
+
+    logger.info("Wrote %s rows to %s", len(df), output_path)
+
+
+if __name__ == "__main__":
+    build_hunting_store()
@@ -1,71 +1,269 @@
 """
 Functions to cache and retrieve geospatial and hunting data,
 as well as configure the Streamlit sidebar for multi page use.
+
+main.py imports this module on every page, including the text only ones, so the
+heavy libraries (pandas, geopandas, plotly, pypdf) are imported by the function
+that needs them and are only loaded once a page asks for data. warm_up loads
+them in a background thread instead.
 """
 
+from __future__ import annotations
+
 import os
+import json
+import hashlib
+import logging
+import threading
 from pathlib import Path
-import pandas as pd
-import geopandas as gpd
+from typing import TYPE_CHECKING
 import streamlit as st
+from app.helpers.figure_cache import FigureCache
+from app.helpers.timing import RunTimings
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import geopandas as gpd
+    from app.helpers.hunting_index import HuntingIndex
+    from app.helpers.draw_odds import DrawOddsIndex
+    from app.helpers.gmu_index import GmuIndex
 
+logger = logging.getLogger(__name__)
 
-@st.cache_data
+
+@st.cache_resource
 def get_geo_data() -> gpd.GeoDataFrame:
-    """loads geographic data from a GeoJSON file.
+    """loads the prepared GMU boundaries, see app.cleaning.geo. If the GeoParquet
+    file has not been built yet the GeoJSON file is prepared in memory instead.
+    The gdf is shared by every session, pages must not modify it in place.
 
     :returns: df for plotting on a map
     """
+    import geopandas as gpd
+    from app.cleaning.geo import prepare_gmu_geometries
+
     file_directory = Path(__file__).parent
 
     asset_directory = file_directory.parent / "assets" / "data"
 
-    gdf = gpd.read_file(os.path.join(asset_directory, "cpw_gmu.geojson"))
+    geo_store_path = asset_directory / "cpw_gmu.parquet"
 
-    gdf = gdf.rename(
-        columns={"GMUID": "GMU", "COUNTY": "County", "ELKDAU": "Elk DAU"},
-    )
+    if geo_store_path.exists():
+        return gpd.read_parquet(geo_store_path)
 
-    gdf["County"] = gdf.County.apply(
-        lambda x: "/".join([county.title() for county in x.split()])
+    return prepare_gmu_geometries(
+        gpd.read_file(os.path.join(asset_directory, "cpw_gmu.geojson"))
     )
 
-    gdf["geometry"] = gdf["geometry"].apply(lambda x: x.simplify(0.001))
 
-    return gdf
+@st.cache_resource
+def get_geo_json(geometry_col: str = "geometry") -> dict | str:
+    """serializes a level of the GMU boundaries to GeoJSON once per process so
+    map reruns only rebuild the per unit values. plot_annual_data picks the level
+    for the session's map zoom and device. With server.enableStaticServing on,
+    the GeoJSON is written to the app's static directory and the URL is returned,
+    then the browser fetches and caches the polygons and they are left out of
+    every figure sent by st.plotly_chart. Otherwise the GeoJSON dict is returned.
+
+    :param geometry_col: geometry column of get_geo_data, see geo.ZOOM_TOLERANCES
+
+    :returns: geojson argument for plot_annual_data
+    """
+    from app.helpers.graphs import gmu_geo_json
+
+    gdf = get_geo_data()
+
+    if geometry_col not in gdf.columns:
+        logger.warning(
+            "%s is not in cpw_gmu.parquet, rebuild it with python -m app.cleaning.geo",
+            geometry_col,
+        )
+
+        geometry_col = "geometry"
+
+    geo_json = gmu_geo_json(gdf, geometry_col)
+
+    if not st.get_option("server.enableStaticServing"):
+        return geo_json
+
+    geo_json_str = json.dumps(geo_json, separators=(",", ":"))
+
+    # The content hash is in the name so browsers never use stale boundaries.
+    content_hash = hashlib.sha256(geo_json_str.encode()).hexdigest()[:12]
+
+    fname = f"cpw_gmu_{content_hash}.geojson"
+
+    static_directory = Path(__file__).parent.parent / "static"
+
+    try:
+        static_directory.mkdir(exist_ok=True)
+
+        if not (static_directory / fname).exists():
+            (static_directory / fname).write_text(geo_json_str)
+    except OSError:
+        logger.warning("Could not write %s, sending GeoJSON with every figure", fname)
 
+        return geo_json
 
-@st.cache_data
+    return f"app/static/{fname}"
+
+
+@st.cache_resource
 def get_hunting_data() -> pd.DataFrame:
-    """loads hunting data from a csv file.
+    """loads the hunting data joined with the OTC data, see app.cleaning.store.
+    The df is shared by every session instead of being copied per call, pages
+    must not modify it in place.
 
     :returns: df for plotting on a hunting stats
     """
+    import pandas as pd
+
     file_directory = Path(__file__).parent
 
     asset_directory = file_directory.parent / "assets" / "data"
 
-    hunt_df = pd.read_csv(os.path.join(asset_directory, "hunting_data.csv"))
+    return pd.read_feather(os.path.join(asset_directory, "hunting_data.feather"))
 
-    otc_df = pd.read_csv(os.path.join(asset_directory, "otc.csv"))
 
-    df = hunt_df.merge(otc_df.rename(columns={"GMUID": "unit"}), on="unit", how="left")
+@st.cache_resource
+def get_statewide_data() -> pd.DataFrame:
+    """rolls the hunting data up to statewide totals once per process, see
+    graphs.summarize_statewide.
+
+    :returns: df with one row per year
+    """
+    from app.helpers.graphs import summarize_statewide
+
+    return summarize_statewide(get_hunting_data())
+
+
+@st.cache_resource
+def get_hunting_index() -> HuntingIndex:
+    """indexes the hunting data by unit and year once per process so pages can
+    slice a unit's series or a year's units without scanning the df.
+
+    :returns: HuntingIndex over get_hunting_data
+    """
+    from app.helpers.hunting_index import HuntingIndex
+
+    return HuntingIndex(get_hunting_data())
+
+
+@st.cache_resource
+def get_gmu_index() -> GmuIndex:
+    """builds the spatial index and adjacency graph of the GMUs once per process.
+
+    :returns: GmuIndex over get_geo_data
+    """
+    from app.helpers.gmu_index import GmuIndex
+
+    return GmuIndex(get_geo_data())
+
+
+@st.cache_resource
+def get_neighbour_index() -> HuntingIndex:
+    """averages the units bordering every unit for all years once per process, see
+    neighbours.neighbour_averages.
+
+    :returns: HuntingIndex over the neighbour averages, by unit and year
+    """
+    from app.helpers.hunting_index import HuntingIndex
+    from app.helpers.neighbours import neighbour_averages
+
+    return HuntingIndex(neighbour_averages(get_hunting_index(), get_gmu_index()))
 
-    df[
-        ["private_either_sex", "private_female", "public_either_sex", "public_female"]
-    ] = df[
-        ["private_either_sex", "private_female", "public_either_sex", "public_female"]
-    ].fillna(
-        False
+
+@st.cache_resource
+def get_draw_results() -> pd.DataFrame:
+    """loads the draw results dataset built by app.cleaning.draw. If it has not been
+    built yet draw_results.csv, parsed from the 2024 primary elk report, is used.
+
+    :returns: df with one row per hunt code and species, year and draw_round columns
+    """
+    import pandas as pd
+    from app.cleaning.draw import DRAW_DATASET_DIRECTORY, add_hunt_code_cols
+
+    if DRAW_DATASET_DIRECTORY.exists():
+        draw_df = pd.read_parquet(DRAW_DATASET_DIRECTORY)
+
+        draw_df["species"] = draw_df["species"].astype(str).astype("category")
+
+        return draw_df
+
+    asset_directory = Path(__file__).parent.parent / "assets" / "data"
+
+    draw_df = pd.read_csv(
+        asset_directory / "draw_results.csv", dtype=str, keep_default_na=False
     )
 
-    df.columns = [col.replace("_", " ").title() for col in df.columns]
+    draw_df = add_hunt_code_cols(
+        draw_df.drop(columns=["animal_sex", "gmu", "method_of_take"])
+    )
+
+    return draw_df.assign(year=2024, draw_round="primary")
+
+
+@st.cache_resource
+def get_draw_odds_index() -> DrawOddsIndex:
+    """sorts the drawn out at values of every applicant type once per process.
+
+    :returns: DrawOddsIndex over get_draw_results
+    """
+    from app.helpers.draw_odds import DrawOddsIndex
+
+    return DrawOddsIndex(get_draw_results())
+
+
+@st.cache_resource
+def get_figure_cache() -> FigureCache:
+    """creates the map figure cache shared by every session.
+
+    :returns: LRU cache of built map figures
+    """
+    return FigureCache(maxsize=256)
+
+
+def _load_app_data():
+    """Runs the loaders of the data visualization pages. The loaders are cached,
+    a page asking for data that is still loading waits for it instead of loading
+    it again. Only a missing or unreadable asset is logged and skipped, any other
+    error is raised in the warm up thread."""
+    from app.helpers.graphs import map_geometry_col
 
-    # df[["Percent Success", "Total Hunters"]] = df[
-    #     ["Percent Success", "Total Hunters"]
-    # ].fillna(0)
+    logger.info("Warming up the app data")
 
-    return df
+    try:
+        get_hunting_index()
+        get_statewide_data()
+
+        # Mobile and desktop map zoom, see st_sidebar
+        get_geo_json(map_geometry_col(5, is_mobile=True))
+        get_geo_json(map_geometry_col(7, is_mobile=False))
+    except OSError as error:
+        # A missing asset, the page that needs it shows the error when opened
+        logger.warning("Warm up stopped, pages will load their data: %s", error)
+
+        return
+
+    logger.info("App data is warm")
+
+
+@st.cache_resource
+def warm_up() -> threading.Thread:
+    """
+    Loads the heavy libraries and the map and trend data in a background thread
+    once per process, so the first visitor gets the page they opened without
+    waiting on data it does not use and the data pages are ready soon after.
+    main.py calls it when the STARTUP_MODE environment variable is "warm", by
+    default everything is loaded by the first page that needs it.
+
+    :returns: the started warm up thread
+    """
+    thread = threading.Thread(target=_load_app_data, name="warm_up", daemon=True)
+
+    thread.start()
+
+    return thread
 
 
 def st_sidebar():
@@ -85,7 +283,14 @@ def st_sidebar():
     - trend_font (int): Font size for trend display.
     - trend_start_year (int): Starting year for trend data.
     - trend_update_layout (dict): Layout settings for trend display.
+    - debug_timings (bool): Indicates if the page timings debug panel is shown. It
+      is turned on by opening the app with ?debug=timings and off with ?debug=off.
     """
+    debug = st.query_params.get("debug")
+
+    if debug is not None:
+        st.session_state.debug_timings = debug == "timings"
+
     if "pages_directory" not in st.session_state.keys():
         app_directory = Path(__file__).parent.parent
 
@@ -126,3 +331,22 @@ def st_sidebar():
         st.session_state.trend_update_layout = {
             "title_y": 1,
         }
+
+
+def st_debug_panel(run_timings: RunTimings):
+    """
+    Shows the stage timings and payload sizes of the page run in the sidebar if
+    the session opted in, see st_sidebar. The timings are logged for every run
+    either way, see app.helpers.timing.
+
+    :param run_timings: timings of the page run that just finished
+    """
+    if not st.session_state.get("debug_timings"):
+        return
+
+    with st.sidebar.expander("Page timings", expanded=True):
+        st.write(f"{run_timings.page}: {run_timings.total_ms:,} ms")
+
+        st.dataframe(run_timings.to_frame(), hide_index=True)
+
+        st.write(f"Figure cache: {get_figure_cache().stats()}")
@@ -0,0 +1,133 @@
+"""
+Index over the draw results that answers which hunt codes an applicant could
+have drawn with a number of preference points, without scanning the df.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Applicant type -> drawn out at column of the draw results
+DRAW_CATEGORIES = {
+    "Adult Resident": "adult_res_draw_at",
+    "Adult Nonresident": "adult_nonrest_draw_at",
+    "Youth Resident": "youth_res_draw_at",
+    "Youth Nonresident": "youth_nonrest_draw_at",
+}
+
+# "Choice-N" drew every first choice applicant and then applicants that listed the
+# hunt code as their Nth choice, so any first choice application drew with no points.
+# Sorted below 0 points, the further down the choices the easier the draw.
+CHOICE_DRAW_POINTS = -1
+
+# "Leftover" still had licenses after the draw.
+LEFTOVER_DRAW_POINTS = -10
+
+
+def normalize_draw_at(draw_at: pd.Series) -> np.ndarray:
+    """Turns drawn out at values into numbers that sort from easiest to hardest draw.
+    A number is the preference points the hunt code drew out at, Choice-N becomes
+    CHOICE_DRAW_POINTS - (N - 2) and Leftover(-Choice-N) LEFTOVER_DRAW_POINTS - (N - 1).
+    ND, no-apps and N/A have no draw history and become NaN.
+
+    >>> normalize_draw_at(pd.Series(["12", "0", "Choice-2", "Choice-4", "Leftover", "ND"]))
+    array([ 12.,   0.,  -1.,  -3., -10.,  nan])
+
+    :param draw_at: values of a *_draw_at column
+
+    :return: float array, lower is easier to draw
+    """
+    draw_at = draw_at.astype(str)
+
+    points = pd.to_numeric(draw_at, errors="coerce").to_numpy(dtype=float)
+
+    choice = draw_at.str.extract(r"^(?P<leftover>Leftover)?-?(?:Choice-(?P<n>\d+))?$")
+
+    choice_n = pd.to_numeric(choice["n"]).to_numpy(dtype=float)
+
+    is_leftover = choice["leftover"].notna().to_numpy()
+
+    points = np.where(
+        is_leftover,
+        LEFTOVER_DRAW_POINTS - np.nan_to_num(choice_n - 1),
+        points,
+    )
+
+    return np.where(
+        ~is_leftover & ~np.isnan(choice_n),
+        CHOICE_DRAW_POINTS - (choice_n - 2),
+        points,
+    )
+
+
+# Columns a draw odds query always selects one value of
+DRAW_KEY_COLS = ["species", "year", "draw_round"]
+
+
+class DrawOddsIndex:
+    """Draw results split by species, year, draw round and applicant type, each
+    part sorted once by its normalized drawn out at values. A query is a dict
+    access, a binary search and a slice.
+
+    Example:
+    >>> draw_odds_index = DrawOddsIndex(get_draw_results())
+    >>> draw_odds_index.drawable("Adult Resident", 3, "elk", 2024, "primary").hunt_code.head(3).tolist()
+    ['EM501O2R', 'EM500O1R', 'EM069O4R']
+
+    :param draw_df: draw results, see app.cleaning.draw
+    """
+
+    def __init__(self, draw_df: pd.DataFrame):
+        self.df = draw_df.reset_index(drop=True)
+
+        # (species, year, draw_round, category) -> draw results hardest draw first
+        # and their draw points easiest first, for searchsorted
+        self._parts = {}
+
+        group_rows = self.df.groupby(DRAW_KEY_COLS, observed=True, sort=False).indices
+
+        for category, col in DRAW_CATEGORIES.items():
+            draw_points = normalize_draw_at(self.df[col])
+
+            for key, rows in group_rows.items():
+                rows = rows[~np.isnan(draw_points[rows])]
+
+                rows = rows[np.argsort(draw_points[rows], kind="stable")]
+
+                self._parts[(*key, category)] = (
+                    self.df.iloc[rows[::-1]].assign(
+                        draw_points=draw_points[rows][::-1]
+                    ),
+                    draw_points[rows],
+                )
+
+    def drawable(
+        self,
+        category: str,
+        preference_points: int,
+        species: str,
+        year: int,
+        draw_round: str,
+    ) -> pd.DataFrame:
+        """Returns the hunt codes that drew out at or below preference_points for an
+        applicant type, hardest draw first. At exactly preference_points only part
+        of the applicants drew, see the final_*_draw_at column. Unknown species,
+        years or rounds return an empty df.
+
+        :param category: key of DRAW_CATEGORIES
+        :param preference_points: applicant's preference points
+        :param species: species of the draw results (e.g., "elk")
+        :param year: draw year
+        :param draw_round: draw round (e.g., "primary")
+
+        :return: draw results with a draw_points column
+        """
+        part = self._parts.get((species, year, draw_round, category))
+
+        if part is None:
+            return self.df.iloc[:0].assign(draw_points=np.array([], dtype=float))
+
+        part_df, draw_points = part
+
+        stop = np.searchsorted(draw_points, preference_points, side="right")
+
+        return part_df.iloc[len(part_df) - stop :]
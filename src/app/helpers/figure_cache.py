@@ -0,0 +1,73 @@
+"""
+Bounded cache of built figures shared by every session, so a selection that
+any user has viewed recently is served without filtering or plotting again.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class FigureCache:
+    """Least recently used cache of figures with hit and miss counters. Figures
+    are shared between sessions, callers must not modify a returned figure.
+
+    Example:
+    >>> figure_cache = FigureCache(maxsize=2)
+    >>> fig = figure_cache.get_or_build((2023, "Total Hunters"), lambda: build_map(2023))
+    >>> figure_cache.stats()
+    {'hits': 0, 'misses': 1, 'size': 1, 'maxsize': 2}
+
+    :param maxsize: number of figures kept before the least recently used is evicted
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Returns the figure cached under key, or builds, caches and returns it.
+        The lock is not held while building so a slow figure does not block
+        sessions asking for other keys.
+
+        :param key: everything the figure depends on
+        :param build: function that builds the figure on a miss
+
+        :return: the figure
+        """
+        with self._lock:
+            if key in self._figures:
+                self.hits += 1
+                self._figures.move_to_end(key)
+
+                return self._figures[key]
+
+        figure = build()
+
+        with self._lock:
+            self.misses += 1
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+
+        return figure
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._figures),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,141 @@
+"""
+Spatial index over the GMU boundaries that answers which unit a point is in and
+which units border a unit, without testing every polygon.
+"""
+
+import numpy as np
+import shapely
+import geopandas as gpd
+
+
+class GmuIndex:
+    """STRtree over the GMU polygons plus the adjacency graph of the units, built
+    once. A point lookup is a tree query, the neighbours of a unit are a dict
+    access. Units border each other when they share a stretch of boundary, units
+    that only meet at a corner are not neighbours.
+
+    The adjacency is also kept in compressed sparse row form over the positions
+    of the units in gmus: the neighbours of gmus[i] are
+    gmus[neighbour_positions[neighbour_offsets[i]:neighbour_offsets[i + 1]]].
+
+    Example:
+    >>> gmu_index = GmuIndex(get_geo_data())
+    >>> unit = gmu_index.locate(lon=-108.1, lat=38.3)
+    >>> gmu_index.neighbours(unit)
+
+    :param geo_df: GMU boundaries with a GMU column, see get_geo_data
+    """
+
+    def __init__(self, geo_df: gpd.GeoDataFrame):
+        self.gmus = geo_df.GMU.to_numpy()
+
+        self._geometries = geo_df.geometry.to_numpy()
+
+        self._tree = shapely.STRtree(self._geometries)
+
+        self._positions = {gmu: i for i, gmu in enumerate(self.gmus.tolist())}
+
+        left, right = self._tree.query(self._geometries, predicate="intersects")
+
+        # Corner touches intersect in a point, shared borders in a line. Overlaps
+        # from boundaries that are not a clean coverage count as borders too.
+        shares_border = (left != right) & (
+            shapely.get_dimensions(
+                shapely.intersection(self._geometries[left], self._geometries[right])
+            )
+            >= 1
+        )
+
+        left, right = left[shares_border], right[shares_border]
+
+        order = np.lexsort((self.gmus[right], left))
+
+        self.neighbour_positions = right[order]
+
+        self.neighbour_offsets = np.searchsorted(
+            left[order], np.arange(len(self.gmus) + 1)
+        )
+
+        self._neighbours = {
+            gmu: self.gmus[
+                self.neighbour_positions[
+                    self.neighbour_offsets[i] : self.neighbour_offsets[i + 1]
+                ]
+            ].tolist()
+            for i, gmu in enumerate(self.gmus.tolist())
+        }
+
+    def locate(self, lon: float, lat: float):
+        """Returns the GMU a point is in, None outside every unit. A point on a
+        border returns one of the units.
+
+        :param lon: longitude in degrees
+        :param lat: latitude in degrees
+
+        :return: GMU number
+        """
+        positions = self._tree.query(shapely.Point(lon, lat), predicate="intersects")
+
+        if len(positions) == 0:
+            return None
+
+        return self.gmus[positions.min()].item()
+
+    def in_bounds(
+        self, min_lon: float, min_lat: float, max_lon: float, max_lat: float
+    ) -> list:
+        """Returns the GMUs that overlap a bounding box, in gmus order.
+
+        :param min_lon: west edge in degrees
+        :param min_lat: south edge in degrees
+        :param max_lon: east edge in degrees
+        :param max_lat: north edge in degrees
+
+        :return: GMU numbers
+        """
+        positions = self._tree.query(
+            shapely.box(min_lon, min_lat, max_lon, max_lat), predicate="intersects"
+        )
+
+        return self.gmus[np.sort(positions)].tolist()
+
+    def neighbours(self, gmu) -> list:
+        """Returns the GMUs that share a border with a unit, sorted. Unknown units
+        have no neighbours.
+
+        :param gmu: GMU number
+
+        :return: GMU numbers
+        """
+        return self._neighbours.get(gmu, [])
+
+    def adjacency(self, gmus: list) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the adjacency graph in compressed sparse row form over another
+        ordering of units, e.g. the units of the hunting data. Units missing from
+        the boundaries have no neighbours, neighbours missing from gmus are left
+        out.
+
+        :param gmus: GMU numbers, the rows and columns of the matrix
+
+        :return: row offsets and column positions into gmus
+        """
+        # Position of every boundary unit in gmus, -1 when it is not in gmus
+        to_position = np.full(len(self.gmus), -1)
+
+        for i, gmu in enumerate(gmus):
+            if gmu in self._positions:
+                to_position[self._positions[gmu]] = i
+
+        rows = to_position[
+            np.repeat(np.arange(len(self.gmus)), np.diff(self.neighbour_offsets))
+        ]
+
+        columns = to_position[self.neighbour_positions]
+
+        kept = (rows >= 0) & (columns >= 0)
+
+        rows, columns = rows[kept], columns[kept]
+
+        order = np.lexsort((columns, rows))
+
+        return np.searchsorted(rows[order], np.arange(len(gmus) + 1)), columns[order]
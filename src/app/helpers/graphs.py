@@ -1,53 +1,126 @@
+import json
+from typing import Callable
 import pandas as pd
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
 import plotly
+from app.cleaning.geo import zoom_level_column
+from app.helpers.hunting_index import HuntingIndex
+from app.helpers.timing import stage, timed
 
+# Zoom levels of boundary detail added to the map's zoom. The desktop map is large
+# and zoomed with the scroll wheel, phones are more often on slow connections.
+MOBILE_DETAIL_HEADROOM = 0
+DESKTOP_DETAIL_HEADROOM = 1
 
+
+def gmu_geo_json(geo_df: pd.DataFrame, geometry_col: str = "geometry") -> dict:
+    """
+    Serializes the GMU boundaries to GeoJSON with each feature's id set to its GMU,
+    so a map can look up polygons by unit instead of by row position.
+
+    :param geo_df: geographical data.
+    :param geometry_col: geometry column to serialize, see geo.zoom_level_column.
+
+    :return: GeoJSON FeatureCollection without properties.
+    """
+    geometry_df = geo_df.set_geometry(geometry_col)[[geometry_col]].set_index(
+        geo_df.GMU.astype(str)
+    )
+
+    return json.loads(geometry_df.to_json(drop_id=False))
+
+
+def map_geometry_col(zoom: float, is_mobile: bool) -> str:
+    """
+    Picks the level of the GMU boundaries to draw for a map zoom and device.
+
+    >>> map_geometry_col(5, is_mobile=True), map_geometry_col(7, is_mobile=False)
+    ('geometry_0.03', 'geometry')
+
+    :param zoom: zoom the map opens at, st.session_state.map_zoom.
+    :param is_mobile: device mode, st.session_state.is_mobile.
+
+    :return: geometry column of get_geo_data, see geo.zoom_level_column.
+    """
+    if is_mobile:
+        return zoom_level_column(zoom + MOBILE_DETAIL_HEADROOM)
+
+    return zoom_level_column(zoom + DESKTOP_DETAIL_HEADROOM)
+
+
+@timed()
 def plot_annual_data(
-    geo_df: pd.DataFrame, hunting_df: pd.DataFrame, color_col: str, opacity: float
+    geo_df: pd.DataFrame,
+    hunting_df: pd.DataFrame,
+    color_col: str,
+    opacity: float,
+    geojson: dict | str | Callable[[str], dict | str] | None = None,
 ) -> plotly.graph_objs._figure.Figure:
     """
-    Plots annual hunting data on a choropleth map using Plotly.
+    Plots annual hunting data on a choropleth map using Plotly. Only the per unit
+    values are built here, the polygons come from geojson which is matched to the
+    units by feature id.
 
     :param geo_df: geographical data.
     :param hunting_df: hunting data.
     :param color_col: Column name to determine the color of the map.
     :param opacity: Opacity level for the map.
+    :param geojson: GMU boundaries from gmu_geo_json, a URL to them, or a function
+        that returns either for a geometry column (cache_state.get_geo_json). For
+        a function the level is picked from the session's map zoom and device, see
+        map_geometry_col. Defaults to serializing that level of geo_df on every call.
 
     :return: map plotting hunting stats on a map.
     """
-    combined_df = geo_df.merge(
-        hunting_df, left_on=["GMU"], right_on=["Unit"], how="left"
-    )
-    combined_df.reset_index(names="location", inplace=True)
+    if geojson is None or callable(geojson):
+        geometry_col = map_geometry_col(
+            st.session_state.map_zoom, st.session_state.is_mobile
+        )
+
+    if geojson is None:
+        if geometry_col not in geo_df.columns:
+            geometry_col = "geometry"
+
+        geojson = gmu_geo_json(geo_df, geometry_col)
+    elif callable(geojson):
+        geojson = geojson(geometry_col)
+
+    with stage("geo merge"):
+        combined_df = pd.DataFrame(geo_df[["GMU", "County", "Elk DAU"]]).merge(
+            hunting_df, left_on=["GMU"], right_on=["Unit"], how="left"
+        )
+        combined_df["location"] = combined_df.GMU.astype(str)
 
     # combined_df[["Percent Success", "Total Hunters"]] = combined_df[
     #     ["Percent Success", "Total Hunters"]
     # ].fillna(0)
 
-    fig = px.choropleth_mapbox(
-        combined_df,
-        geojson=combined_df.geometry,
-        locations=combined_df.location,
-        color=color_col,
-        color_continuous_scale="emrld",  # https://plotly.com/python/builtin-colorscales/
-        opacity=opacity,
-        hover_data={
-            "location": False,
-            "GMU": True,
-            "County": True,
-            "Elk DAU": True,
-            "Total Hunters": True,
-            "Private Either Sex": True,
-            "Private Female": True,
-            "Public Either Sex": True,
-            "Public Female": True,
-        },
-        mapbox_style="carto-positron",
-        center={"lat": 38.9, "lon": -105.7821},
-        zoom=st.session_state.map_zoom,
-    )
+    with stage("px.choropleth_mapbox"):
+        fig = px.choropleth_mapbox(
+            combined_df,
+            geojson=geojson,
+            locations="location",
+            featureidkey="id",
+            color=color_col,
+            color_continuous_scale="emrld",  # https://plotly.com/python/builtin-colorscales/
+            opacity=opacity,
+            hover_data={
+                "location": False,
+                "GMU": True,
+                "County": True,
+                "Elk DAU": True,
+                "Total Hunters": True,
+                "Private Either Sex": True,
+                "Private Female": True,
+                "Public Either Sex": True,
+                "Public Female": True,
+            },
+            mapbox_style="carto-positron",
+            center={"lat": 38.9, "lon": -105.7821},
+            zoom=st.session_state.map_zoom,
+        )
 
     fig.update_layout(autosize=True)
 
@@ -56,12 +129,150 @@ def plot_annual_data(
     return fig
 
 
+def highlight_units(
+    fig: plotly.graph_objs._figure.Figure, unit: int, neighbours: list[int]
+) -> plotly.graph_objs._figure.Figure:
+    """
+    Outlines a unit and the units bordering it on a map from plot_annual_data. The
+    figure is copied first, figures in the figure cache are shared by sessions.
+    When the map's GeoJSON is inlined, the outline trace only gets the features of
+    the outlined units, so a selection does not send every boundary twice.
+
+    :param fig: map from plot_annual_data.
+    :param unit: selected GMU, outlined in red.
+    :param neighbours: GMUs bordering it, outlined in orange (see GmuIndex).
+
+    :return: map with an outline trace on top.
+    """
+    highlighted_fig = go.Figure(fig)
+
+    locations = [str(gmu) for gmu in [unit] + neighbours]
+
+    geojson = fig.data[0].geojson
+
+    # A URL to the static GeoJSON is fetched once by the browser, keep it
+    if isinstance(geojson, dict):
+        outlined = set(locations)
+
+        geojson = {
+            **geojson,
+            "features": [
+                feature
+                for feature in geojson["features"]
+                if feature.get("id") in outlined
+            ],
+        }
+
+    highlighted_fig.add_trace(
+        go.Choroplethmapbox(
+            geojson=geojson,
+            featureidkey="id",
+            locations=locations,
+            z=[1] * (len(neighbours) + 1),
+            colorscale=[[0, "rgba(0,0,0,0)"], [1, "rgba(0,0,0,0)"]],
+            showscale=False,
+            hoverinfo="skip",
+            marker_line_color=["#d62728"] + ["#ff7f0e"] * len(neighbours),
+            marker_line_width=[4] + [2] * len(neighbours),
+        )
+    )
+
+    return highlighted_fig
+
+
+def summarize_statewide(hunter_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rolls the unit data up to one row per year. Counts are summed, "Percent Success"
+    is the unweighted mean of the unit success rates and "Weighted Percent Success"
+    weights each unit's rate by its number of hunters.
+
+    :param hunter_df: hunting data.
+
+    :return: statewide data by year.
+    """
+    count_cols = [
+        "Bulls",
+        "Cows",
+        "Calves",
+        "Total Harvest",
+        "Total Hunters",
+        "Percent Success",
+        "Total Rec Days",
+    ]
+
+    # The store uses small int dtypes, which groupby sums keep and could overflow.
+    count_df = hunter_df[["Year"] + count_cols].astype(
+        {col: "int64" for col in count_cols}
+    )
+
+    statewide_df = (
+        count_df.assign(
+            weighted_success=count_df["Percent Success"] * count_df["Total Hunters"]
+        )
+        .groupby("Year", as_index=False)
+        .agg(
+            {
+                "Bulls": "sum",
+                "Cows": "sum",
+                "Calves": "sum",
+                "Total Harvest": "sum",
+                "Total Hunters": "sum",
+                "Percent Success": "mean",
+                "Total Rec Days": "sum",
+                "weighted_success": "sum",
+            }
+        )
+    )
+
+    statewide_df["Percent Success"] = statewide_df["Percent Success"].round()
+
+    statewide_df["Weighted Percent Success"] = (
+        statewide_df.pop("weighted_success") / statewide_df["Total Hunters"]
+    ).round()
+
+    return statewide_df
+
+
+def style_trend_figure(
+    fig: plotly.graph_objs._figure.Figure, title: str
+) -> plotly.graph_objs._figure.Figure:
+    """
+    Applies the title, fonts and session layout shared by the trend line charts.
+
+    :param fig: line chart from plot_metrics or plot_neighbour_comparison.
+    :param title: Title of the plot.
+
+    :return: styled chart.
+    """
+    fig.update_layout(
+        title={"text": title, "x": 0.5, "xanchor": "center"},
+        title_font=dict(size=24),
+        xaxis=dict(title_font=dict(size=18), tickfont=dict(size=18)),
+        yaxis=dict(
+            title_font=dict(size=18),
+            tickfont=dict(size=18),
+            tickformat=",",
+        ),
+    )
+
+    fig.update_traces(textposition="top center", textfont=dict(size=16))
+
+    fig.update_layout(autosize=True)
+
+    fig.update_layout(**st.session_state.trend_update_layout)
+
+    return fig
+
+
+@timed()
 def plot_metrics(
     hunter_df: pd.DataFrame,
     metrics: list[str],
     unit: list[int],
     title: str,
     year_range: list[int],
+    statewide_df: pd.DataFrame | None = None,
+    hunting_index: HuntingIndex | None = None,
 ) -> plotly.graph_objs._figure.Figure:
     """
     Plots the specified metrics for hunters over a given range of years.
@@ -71,30 +282,27 @@ def plot_metrics(
     :param unit: unit numbers to filter the data by. Use "All" to include all units.
     :param title: Title of the plot.
     :param year_range: start and end year for the plot (e.g., [2010, 2020]).
+    :param statewide_df: summarize_statewide of hunter_df, used when unit is "All".
+        Computed from hunter_df if not given.
+    :param hunting_index: HuntingIndex of hunter_df, used to slice a single unit.
+        hunter_df is filtered with masks if not given.
 
     :return: plotted metrics.
     """
-    hunter_df = hunter_df.loc[
-        (hunter_df.Year >= year_range[0]) & (hunter_df.Year <= year_range[1])
-    ]
-
     if unit == "All":
-        modified_hunter_df = hunter_df.groupby("Year", as_index=False).agg(
-            {
-                "Bulls": "sum",
-                "Cows": "sum",
-                "Calves": "sum",
-                "Total Harvest": "sum",
-                "Total Hunters": "sum",
-                "Percent Success": "mean",
-                "Total Rec Days": "sum",
-            }
-        )
+        if statewide_df is None:
+            statewide_df = summarize_statewide(hunter_df)
 
-        modified_hunter_df["Percent Success"] = modified_hunter_df[
-            "Percent Success"
-        ].round()
+        modified_hunter_df = statewide_df.loc[
+            (statewide_df.Year >= year_range[0]) & (statewide_df.Year <= year_range[1])
+        ]
+    elif hunting_index is not None:
+        modified_hunter_df = hunting_index.unit_series(unit, year_range)
     else:
+        hunter_df = hunter_df.loc[
+            (hunter_df.Year >= year_range[0]) & (hunter_df.Year <= year_range[1])
+        ]
+
         modified_hunter_df = hunter_df.loc[hunter_df.Unit.isin([unit])]
 
     df_long = modified_hunter_df.melt(
@@ -113,21 +321,46 @@ def plot_metrics(
         color_discrete_sequence=["#005845", "#629abf", "#00b4b1"],
     )
 
-    fig.update_layout(
-        title={"text": title, "x": 0.5, "xanchor": "center"},
-        title_font=dict(size=24),
-        xaxis=dict(title_font=dict(size=18), tickfont=dict(size=18)),
-        yaxis=dict(
-            title_font=dict(size=18),
-            tickfont=dict(size=18),
-            tickformat=",",
-        ),
+    return style_trend_figure(fig, title)
+
+
+@timed()
+def plot_neighbour_comparison(
+    unit_df: pd.DataFrame,
+    neighbour_df: pd.DataFrame,
+    metric: str,
+    unit: int,
+) -> plotly.graph_objs._figure.Figure:
+    """
+    Plots a metric of a unit against the average of the units bordering it.
+
+    :param unit_df: the unit's series, see HuntingIndex.unit_series.
+    :param neighbour_df: its neighbours' series, see get_neighbour_index.
+    :param metric: metric to plot (e.g., "Total Hunters").
+    :param unit: GMU number, used in the legend.
+
+    :return: plotted comparison.
+    """
+    df_long = pd.concat(
+        [
+            unit_df[["Year", metric]].assign(Series=f"GMU {unit}"),
+            neighbour_df[["Year", metric]].assign(Series="Neighbouring GMUs average"),
+        ]
     )
 
-    fig.update_traces(textposition="top center", textfont=dict(size=16))
+    # Neighbours without hunters have no Percent Success to average
+    df_long = df_long.dropna(subset=[metric])
 
-    fig.update_layout(autosize=True)
+    df_long["formatted_Count"] = df_long[metric].apply(lambda x: f"{x:,.1f}")
 
-    fig.update_layout(**st.session_state.trend_update_layout)
+    fig = px.line(
+        df_long,
+        x="Year",
+        y=metric,
+        color="Series",
+        markers=True,
+        text="formatted_Count",
+        color_discrete_sequence=["#005845", "#629abf"],
+    )
 
-    return fig
+    return style_trend_figure(fig, f"{metric}: GMU {unit} and its Neighbours")
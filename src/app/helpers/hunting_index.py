@@ -0,0 +1,93 @@
+"""
+Index over the hunting data so pages can look up a unit's series or a year's
+units without scanning every row on each interaction.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class HuntingIndex:
+    """Hunting data sorted by (Unit, Year) with the row offsets of every unit,
+    plus a second ordering by Year with the offsets of every year. Lookups are a
+    dict access and a slice, a year range inside a unit is a binary search.
+
+    Example:
+    >>> hunting_index = HuntingIndex(get_hunting_data())
+    >>> hunting_index.unit_series(61, (2019, 2023)).Year.tolist()
+    [2019, 2020, 2021, 2022, 2023]
+    >>> len(hunting_index.year_slice(2023))
+    145
+
+    :param hunter_df: hunting data with Unit and Year columns
+    """
+
+    def __init__(self, hunter_df: pd.DataFrame):
+        self.df = hunter_df.sort_values(["Unit", "Year"], kind="stable").reset_index(
+            drop=True
+        )
+
+        self._years = self.df["Year"].to_numpy()
+
+        self._unit_offsets = self._group_offsets(self.df["Unit"].to_numpy())
+
+        self._year_order = np.argsort(self._years, kind="stable")
+
+        self._year_offsets = self._group_offsets(self._years[self._year_order])
+
+    @staticmethod
+    def _group_offsets(sorted_values: np.ndarray) -> dict:
+        """Maps each value of a sorted array to the (start, stop) of its run."""
+        starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+
+        stops = np.r_[starts[1:], len(sorted_values)]
+
+        return {
+            value: (start, stop)
+            for value, start, stop in zip(
+                sorted_values[starts].tolist(), starts.tolist(), stops.tolist()
+            )
+        }
+
+    @property
+    def units(self) -> list:
+        return list(self._unit_offsets)
+
+    @property
+    def years(self) -> list:
+        return list(self._year_offsets)
+
+    def unit_series(
+        self, unit, year_range: tuple[int, int] | None = None
+    ) -> pd.DataFrame:
+        """Returns the rows of one unit sorted by year, optionally limited to an
+        inclusive year range. Unknown units return an empty df.
+
+        :param unit: GMU number
+        :param year_range: start and end year (e.g., (2010, 2020))
+
+        :return: hunting data for the unit
+        """
+        start, stop = self._unit_offsets.get(unit, (0, 0))
+
+        if year_range is not None:
+            unit_years = self._years[start:stop]
+
+            start, stop = (
+                start + np.searchsorted(unit_years, year_range[0], side="left"),
+                start + np.searchsorted(unit_years, year_range[1], side="right"),
+            )
+
+        return self.df.iloc[start:stop]
+
+    def year_slice(self, year: int) -> pd.DataFrame:
+        """Returns the rows of every unit for one year, sorted by unit. Unknown
+        years return an empty df.
+
+        :param year: hunting year
+
+        :return: hunting data for the year
+        """
+        start, stop = self._year_offsets.get(year, (0, 0))
+
+        return self.df.iloc[self._year_order[start:stop]]
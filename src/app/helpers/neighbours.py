@@ -0,0 +1,114 @@
+"""
+Aggregates of the units bordering every GMU, so a unit's trend can be compared
+to the units around it. The aggregates of every unit and year are computed at
+once as the product of the sparse adjacency matrix and the (unit, year) metrics.
+"""
+
+import numpy as np
+import pandas as pd
+from app.helpers.gmu_index import GmuIndex
+from app.helpers.hunting_index import HuntingIndex
+
+# Count metrics averaged over the neighbours that reported a year
+NEIGHBOUR_COUNT_METRICS = ["Bulls", "Cows", "Calves", "Total Harvest", "Total Hunters"]
+
+
+def sparse_matmul(
+    offsets: np.ndarray, positions: np.ndarray, values: np.ndarray
+) -> np.ndarray:
+    """Multiplies a 0/1 matrix in compressed sparse row form with a dense matrix,
+    row i of the result is the sum of the rows of values at
+    positions[offsets[i]:offsets[i + 1]]. Empty rows sum to 0. Each row is summed
+    on its own, a NaN only reaches the rows that include it.
+
+    :param offsets: row offsets, one more than the number of rows
+    :param positions: column positions of the ones
+    :param values: dense matrix with a row per column of the sparse matrix
+
+    :return: dense matrix with a row per row of the sparse matrix
+    """
+    result = np.zeros((len(offsets) - 1, values.shape[1]))
+
+    # reduceat gives an empty row the value at its offset, so only the rows with
+    # ones are reduced, each up to the start of the next of them.
+    filled = offsets[1:] > offsets[:-1]
+
+    if filled.any():
+        result[filled] = np.add.reduceat(
+            values[positions], offsets[:-1][filled], axis=0
+        )
+
+    return result
+
+
+def neighbour_averages(
+    hunting_index: HuntingIndex, gmu_index: GmuIndex
+) -> pd.DataFrame:
+    """
+    Averages the metrics of the units bordering each unit for every year. Counts
+    are the mean over the neighbours with data for the year, "Percent Success" is
+    weighted by their hunters like "Weighted Percent Success" in
+    graphs.summarize_statewide. Years none of a unit's neighbours reported are left
+    out.
+
+    Example:
+    >>> neighbour_index = HuntingIndex(neighbour_averages(hunting_index, gmu_index))
+    >>> neighbour_index.unit_series(61, (2019, 2023))
+
+    :param hunting_index: HuntingIndex of the hunting data.
+    :param gmu_index: GmuIndex of the GMU boundaries.
+
+    :return: df with Unit, Year, the averaged metrics and "Reporting Neighbours".
+    """
+    units, years = hunting_index.units, hunting_index.years
+
+    hunter_df = hunting_index.df
+
+    # (unit, year) x (metric) matrix: the counts, hunter weighted success and a
+    # 1 for every unit that reported the year
+    values = np.zeros((len(units), len(years), len(NEIGHBOUR_COUNT_METRICS) + 2))
+
+    values[
+        pd.Index(units).get_indexer(hunter_df.Unit),
+        np.searchsorted(years, hunter_df.Year),
+    ] = np.column_stack(
+        [
+            hunter_df[NEIGHBOUR_COUNT_METRICS].to_numpy(dtype="float64"),
+            hunter_df["Percent Success"].to_numpy(dtype="float64")
+            * hunter_df["Total Hunters"].to_numpy(dtype="float64"),
+            np.ones(len(hunter_df)),
+        ]
+    )
+
+    offsets, positions = gmu_index.adjacency(units)
+
+    sums = sparse_matmul(offsets, positions, values.reshape(len(units), -1)).reshape(
+        values.shape
+    )
+
+    reporting = sums[:, :, -1]
+
+    unit_positions, year_positions = np.nonzero(reporting)
+
+    sums, reporting = (
+        sums[unit_positions, year_positions],
+        reporting[unit_positions, year_positions],
+    )
+
+    neighbour_df = pd.DataFrame(
+        sums[:, : len(NEIGHBOUR_COUNT_METRICS)] / reporting[:, None],
+        columns=NEIGHBOUR_COUNT_METRICS,
+    ).round(1)
+
+    hunters = sums[:, NEIGHBOUR_COUNT_METRICS.index("Total Hunters")]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        neighbour_df["Percent Success"] = np.round(sums[:, -2] / hunters)
+
+    neighbour_df["Reporting Neighbours"] = reporting.astype("int64")
+
+    neighbour_df.insert(0, "Unit", np.asarray(units)[unit_positions])
+
+    neighbour_df.insert(1, "Year", np.asarray(years)[year_positions])
+
+    return neighbour_df
@@ -0,0 +1,181 @@
+"""
+Records how long each stage of a page run takes and how big its payloads are, so
+a slow interaction can be traced to loading, filtering, plotting or sending the
+figure. main.py wraps every run in page_run, pages and helpers mark stages with
+stage or timed. Outside a page run, e.g. in tests and the cleaning scripts, the
+stages are not recorded.
+
+Every run is logged as one JSON line:
+    page run {"page": "Interactive Map", "total_ms": 182.4, "stages": [{"stage": "plot_annual_data", "ms": 95.1, ...}]}
+"""
+
+import json
+import time
+import logging
+import functools
+import contextvars
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_current_run = contextvars.ContextVar("current_run", default=None)
+
+
+class RunTimings:
+    """Stages of a single page run in the order they finished. Nested stages
+    finish first and have the depth of their parent plus one.
+
+    :param page: title of the page that ran
+    """
+
+    def __init__(self, page: str):
+        self.page = page
+        self.stages = []
+        self.total_ms = None
+        self._depth = 0
+        self._start = time.perf_counter()
+
+    def enter(self):
+        """Starts a stage, stages recorded until its exit are nested in it."""
+        self._depth += 1
+
+    def exit(self, name: str, ms: float):
+        """Ends the innermost stage and records it.
+
+        :param name: stage name
+        :param ms: how long the stage took in milliseconds
+        """
+        self._depth -= 1
+
+        self.stages.append({"stage": name, "ms": ms, "depth": self._depth})
+
+    def add_size(self, name: str, nbytes: int):
+        """Records the size of a payload, like a df or a serialized figure.
+
+        :param name: what the payload is
+        :param nbytes: its size in bytes
+        """
+        self.stages.append({"stage": name, "bytes": int(nbytes), "depth": self._depth})
+
+    def finish(self):
+        self.total_ms = round((time.perf_counter() - self._start) * 1000, 1)
+
+    def to_dict(self) -> dict:
+        return {"page": self.page, "total_ms": self.total_ms, "stages": self.stages}
+
+    def to_frame(self) -> "pd.DataFrame":
+        """Stages as a df for the debug panel, nested stage names are indented."""
+        # Imported here so main.py does not load pandas for the text only pages.
+        import pandas as pd
+
+        return pd.DataFrame(
+            [
+                {**stage, "stage": "  " * stage["depth"] + stage["stage"]}
+                for stage in self.stages
+            ],
+            columns=["stage", "ms", "bytes"],
+        )
+
+
+@contextmanager
+def page_run(page: str) -> Iterator[RunTimings]:
+    """Records the stages of everything run inside the block as one page run and
+    logs them when it ends, also when the page raised.
+
+    Example:
+    >>> with page_run("Unit Trends") as run_timings:
+    ...     pg.run()
+
+    :param page: title of the page
+
+    :return: the run's timings, complete once the block has ended
+    """
+    run_timings = RunTimings(page)
+
+    token = _current_run.set(run_timings)
+
+    try:
+        yield run_timings
+    finally:
+        _current_run.reset(token)
+
+        run_timings.finish()
+
+        logger.info(
+            "page run %s", json.dumps(run_timings.to_dict(), ensure_ascii=False)
+        )
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Times the block as a stage of the current page run.
+
+    Example:
+    >>> with stage("filter units"):
+    ...     year_df = year_df.loc[year_df[metric] >= low]
+
+    :param name: stage name shown in the log and debug panel
+    """
+    run_timings = _current_run.get()
+
+    if run_timings is None:
+        yield
+        return
+
+    run_timings.enter()
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        run_timings.exit(name, round((time.perf_counter() - start) * 1000, 1))
+
+
+def timed(name: str | None = None) -> Callable:
+    """Decorator version of stage, named after the function by default.
+
+    :param name: stage name
+
+    :return: decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name or func.__name__):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_size(name: str, payload) -> None:
+    """Records the size of a df (its memory without object contents), str or bytes
+    in the current page run.
+
+    :param name: what the payload is
+    :param payload: df, str or bytes
+    """
+    run_timings = _current_run.get()
+
+    if run_timings is None:
+        return
+
+    if hasattr(payload, "memory_usage"):
+        nbytes = payload.memory_usage(index=True).sum()
+    elif isinstance(payload, str):
+        nbytes = len(payload.encode())
+    else:
+        nbytes = len(payload)
+
+    run_timings.add_size(name, nbytes)
+
+
+def current_run() -> RunTimings | None:
+    """Returns the timings of the page run in progress, None outside a run."""
+    return _current_run.get()
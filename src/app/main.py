@@ -4,13 +4,31 @@ Entry point for the app.
 helpers:
     caches datasets for app to use
     creates session variables for user inputs
+    times every page run, see app.helpers.timing
+
+Data is loaded by the pages that use it. With the STARTUP_MODE environment
+variable set to "warm" it is also loaded in a background thread when the first
+visitor opens the app, see cache_state.warm_up.
 """
 
+import os
+import sys
+import logging
 import streamlit as st
-from app.helpers.cache_state import st_sidebar, get_geo_data, get_hunting_data
+from app.helpers.cache_state import st_sidebar, st_debug_panel, warm_up
+from app.helpers.timing import page_run
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(filename)s] [%(funcName)20s()] [%(levelname)s] - %(message)s",
+    stream=sys.stdout,
+)
 
 st.set_page_config(layout="wide")
 
+if os.environ.get("STARTUP_MODE", "lazy") == "warm":
+    warm_up()
+
 st_sidebar()
 
 pages = {
@@ -29,12 +47,14 @@ pages = {
             st.session_state.pages_directory / "unit_trends.py", title="📈Unit Trends"
         ),
     ],
+    "Draw Planning": [
+        st.Page(st.session_state.pages_directory / "draw_odds.py", title="🎯Draw Odds"),
+    ],
 }
 
-get_geo_data()
-
-get_hunting_data()
-
 pg = st.navigation(pages)
 
-pg.run()
+with page_run(pg.title) as run_timings:
+    pg.run()
+
+st_debug_panel(run_timings)
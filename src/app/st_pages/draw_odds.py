@@ -0,0 +1,92 @@
+import streamlit as st
+from app.helpers.cache_state import get_draw_results, get_draw_odds_index
+from app.helpers.draw_odds import DRAW_CATEGORIES
+from app.helpers.timing import stage
+
+st.title("Which Hunt Codes Can I Draw?")
+
+with stage("load data"):
+    draw_df = get_draw_results()
+
+    draw_odds_index = get_draw_odds_index()
+
+with st.expander("More information about draw odds"):
+    st.write(
+        """
+        CPW publishes the preference points each hunt code drew out at for every type of applicant. Pick
+    how many preference points you have and the hunt codes that drew out at or below them are listed,
+    hardest to draw first.
+
+    If a hunt code drew out at exactly your points, only some of the applicants with those points
+    drew a license, the "Drawn at Final Level" column shows how many. "Choice-N" means every first
+    choice applicant drew, "Leftover" means licenses were left after the draw.
+    """
+    )
+
+with st.container():
+    col1, col2 = st.columns(2)
+
+    category = col1.selectbox(label="Applicant Type", options=list(DRAW_CATEGORIES))
+
+    preference_points = col1.number_input(
+        label="Preference Points", min_value=0, max_value=40, value=0, step=1
+    )
+
+    species = col2.selectbox(
+        label="Species", options=sorted(draw_df.species.dropna().unique())
+    )
+
+    year = col2.selectbox(
+        label="Draw Year", options=sorted(draw_df.year.unique(), reverse=True)
+    )
+
+    draw_round = col2.selectbox(
+        label="Draw Round", options=sorted(draw_df.draw_round.unique())
+    )
+
+    methods = col1.multiselect(
+        label="Method of Take",
+        options=draw_df.method_of_take.dropna().unique().tolist(),
+        default=draw_df.method_of_take.dropna().unique().tolist(),
+    )
+
+with stage("filter hunt codes"):
+    drawable_df = draw_odds_index.drawable(
+        category, preference_points, species, year, draw_round
+    )
+
+    drawable_df = drawable_df.loc[drawable_df.method_of_take.isin(methods)]
+
+draw_at_col = DRAW_CATEGORIES[category]
+
+st.write(
+    f"{len(drawable_df):,} hunt codes drew out at {preference_points} points or less"
+)
+
+st.dataframe(
+    drawable_df[
+        [
+            "hunt_code",
+            "gmu",
+            "animal_sex",
+            "method_of_take",
+            "season",
+            "list_code",
+            draw_at_col,
+            f"final_{draw_at_col}",
+        ]
+    ].rename(
+        columns={
+            "hunt_code": "Hunt Code",
+            "gmu": "GMU",
+            "animal_sex": "Sex",
+            "method_of_take": "Method of Take",
+            "season": "Season",
+            "list_code": "List",
+            draw_at_col: "Drawn Out At",
+            f"final_{draw_at_col}": "Drawn at Final Level",
+        }
+    ),
+    hide_index=True,
+    use_container_width=True,
+)
@@ -1,12 +1,29 @@
 import streamlit as st
-from app.helpers.cache_state import get_geo_data, get_hunting_data
-from app.helpers.graphs import plot_annual_data
+from app.helpers.cache_state import (
+    get_geo_data,
+    get_geo_json,
+    get_hunting_data,
+    get_hunting_index,
+    get_figure_cache,
+    get_gmu_index,
+)
+from app.helpers.graphs import plot_annual_data, highlight_units
+from app.helpers.timing import stage, record_size
+
+# Float metrics of a unit's DAU, see app.cleaning.population
+DAU_METRICS = (
+    "Post Hunt Estimate",
+    "Bull Cow Ratio",
+    "Harvest Population Ratio",
+    "Hunters Per 1000 Elk",
+)
 
 st.title("Elk Archery Percent Success and Number of Hunters")
 
-gdf = get_geo_data()
+with stage("load data"):
+    gdf = get_geo_data()
 
-hunter_df = get_hunting_data()
+    hunter_df = get_hunting_data()
 
 with st.expander("More information about the map"):
     st.write(
@@ -17,6 +34,13 @@ with st.expander("More information about the map"):
     the metric "Total Hunters", units with the darkest color had the most hunters for a given year.
 
     If a GMU is not plotted then there is no data available for the metric and filters selection.
+
+    The population metrics are for the Data Analysis Unit (DAU, a herd) a GMU belongs to, from CPW's
+    post hunt population estimates. Harvest Population Ratio and Hunters Per 1000 Elk count every
+    manner of take, not only archery. They are only available for years with an estimate.
+
+    Click a unit on the map, or enter coordinates under "Find a Unit", to outline it and the units
+    bordering it and list their stats for the year.
     """
     )
 
@@ -33,7 +57,8 @@ with st.container():
             "Calves",
             "Total Harvest",
             "Total Rec Days",
-        ),
+        )
+        + DAU_METRICS,
     )
 
     year = col1.selectbox(
@@ -64,24 +89,123 @@ with st.container():
 
     if metric == "Percent Success":
         metric_range = col2.slider(label=f"Select range for {metric}", value=(0, 100))
+    elif metric in DAU_METRICS:
+        metric_range = col2.slider(
+            label=f"Select range for {metric}",
+            value=(0.0, float(hunter_df[metric].max())),
+        )
     else:
         metric_range = col2.slider(
             label=f"Select range for {metric}", value=(0, hunter_df[metric].max())
         )
 
-    filtered_hunter_df = hunter_df.loc[
-        (hunter_df.Year == year)
-        & (hunter_df[metric] >= metric_range[0])
-        & (hunter_df[metric] <= metric_range[1])
-        & (hunter_df[otc_cols_selected].any(axis=1))
-    ].copy()
+    def build_figure():
+        with stage("filter units"):
+            year_df = get_hunting_index().year_slice(year)
+
+            filtered_hunter_df = year_df.loc[
+                (year_df[metric] >= metric_range[0])
+                & (year_df[metric] <= metric_range[1])
+                & (year_df[otc_cols_selected].any(axis=1))
+            ].copy()
+
+        record_size("filtered units", filtered_hunter_df)
 
-    st.session_state.fig = plot_annual_data(
-        gdf, filtered_hunter_df, metric, opacity_float
+        return plot_annual_data(
+            gdf,
+            filtered_hunter_df,
+            metric,
+            opacity_float,
+            get_geo_json,
+        )
+
+    figure_key = (
+        year,
+        metric,
+        tuple(metric_range),
+        tuple(otc_cols_selected),
+        opacity_float,
+        st.session_state.get("is_mobile"),
     )
 
-    with st.container():
+    with stage("get figure"):
+        st.session_state.fig = get_figure_cache().get_or_build(figure_key, build_figure)
+
+    with st.expander("Find a Unit"):
+        col1, col2 = st.columns(2)
+
+        latitude = col1.number_input(
+            label="Latitude", value=None, min_value=36.9, max_value=41.1, format="%.5f"
+        )
+
+        longitude = col2.number_input(
+            label="Longitude",
+            value=None,
+            min_value=-109.1,
+            max_value=-102.0,
+            format="%.5f",
+        )
+
+    with stage("find unit"):
+        gmu_index = get_gmu_index()
+
+        # The unit clicked on the map in the previous run, see st.plotly_chart below
+        clicked_points = st.session_state.get("gmu_map", {}).get("selection", {})
+
+        selected_unit = None
+
+        if latitude is not None and longitude is not None:
+            selected_unit = gmu_index.locate(longitude, latitude)
+
+            if selected_unit is None:
+                st.warning(f"{latitude}, {longitude} is not in a GMU")
+        elif clicked_points.get("points"):
+            selected_unit = int(clicked_points["points"][0]["location"])
+
+        fig = st.session_state.fig
+
+        if selected_unit is not None:
+            neighbours = gmu_index.neighbours(selected_unit)
+
+            fig = highlight_units(fig, selected_unit, neighbours)
+
+    with st.container(), stage("st.plotly_chart"):
         st.plotly_chart(
-            st.session_state.fig,
+            fig,
             use_container_width=True,
+            key="gmu_map",
+            on_select="rerun",
+            selection_mode="points",
         )
+
+    if selected_unit is not None:
+        if neighbours:
+            st.write(
+                f"GMU {selected_unit} borders GMUs {', '.join(map(str, neighbours))}"
+            )
+        else:
+            st.write(f"GMU {selected_unit} does not border another GMU")
+
+        year_df = get_hunting_index().year_slice(year)
+
+        st.dataframe(
+            year_df.set_index("Unit")
+            .reindex([selected_unit] + neighbours)
+            .reset_index()[
+                [
+                    "Unit",
+                    "Total Hunters",
+                    "Total Harvest",
+                    "Percent Success",
+                    "Bulls",
+                    "Cows",
+                    "Calves",
+                ]
+            ],
+            hide_index=True,
+        )
+
+    # Serializing the figure again is about as slow as sending it, only measured
+    # when the debug panel is shown.
+    if st.session_state.get("debug_timings"):
+        record_size("figure json", fig.to_json())
@@ -1,12 +1,23 @@
 import streamlit as st
-from app.helpers.cache_state import get_hunting_data
-from app.helpers.graphs import plot_metrics
+from app.helpers.cache_state import (
+    get_hunting_data,
+    get_hunting_index,
+    get_neighbour_index,
+    get_statewide_data,
+)
+from app.helpers.graphs import plot_metrics, plot_neighbour_comparison
+from app.helpers.timing import stage
+
+with stage("load data"):
+    hunter_df = get_hunting_data()
 
-hunter_df = get_hunting_data()
+    statewide_df = get_statewide_data()
+
+    hunting_index = get_hunting_index()
 
 unit = st.selectbox(
     label="Select a GMU",
-    options=["All"] + hunter_df.sort_values("Unit").Unit.unique().tolist(),
+    options=["All"] + hunting_index.units,
 )
 
 year_range = st.slider(
@@ -17,6 +28,45 @@ year_range = st.slider(
     step=1,
 )
 
+if unit != "All" and st.toggle(
+    "Compare to neighbouring units",
+    help="Plots the unit against the average of the GMUs that share a border with it.",
+):
+    metric = st.selectbox(
+        label="Select a metric",
+        options=[
+            "Total Hunters",
+            "Total Harvest",
+            "Percent Success",
+            "Bulls",
+            "Cows",
+            "Calves",
+        ],
+    )
+
+    with stage("neighbour averages"):
+        neighbour_index = get_neighbour_index()
+
+    neighbour_df = neighbour_index.unit_series(unit, year_range)
+
+    if neighbour_df.empty:
+        st.warning(f"No neighbouring GMU of GMU {unit} has data for these years")
+    else:
+        st.plotly_chart(
+            plot_neighbour_comparison(
+                hunting_index.unit_series(unit, year_range),
+                neighbour_df,
+                metric,
+                unit,
+            ),
+            config={"displayModeBar": False},
+        )
+
+        st.caption(
+            f"Averaged over up to {neighbour_df['Reporting Neighbours'].max()} neighbouring GMUs,"
+            " Percent Success is weighted by each unit's hunters."
+        )
+
 st.plotly_chart(
     plot_metrics(
         hunter_df,
@@ -24,6 +74,8 @@ st.plotly_chart(
         unit,
         "Bulls, Cows and Calves",
         year_range,
+        statewide_df,
+        hunting_index,
     ),
     config={"displayModeBar": False},
 )
@@ -35,11 +87,26 @@ st.plotly_chart(
         unit,
         "Total Hunters and Total Harvest",
         year_range,
+        statewide_df,
+        hunting_index,
     ),
     config={"displayModeBar": False},
 )
 
+if unit == "All":
+    success_metrics = ["Percent Success", "Weighted Percent Success"]
+else:
+    success_metrics = ["Percent Success"]
+
 st.plotly_chart(
-    plot_metrics(hunter_df, ["Percent Success"], unit, "Percent Success", year_range),
+    plot_metrics(
+        hunter_df,
+        success_metrics,
+        unit,
+        "Percent Success",
+        year_range,
+        statewide_df,
+        hunting_index,
+    ),
     config={"displayModeBar": False},
 )
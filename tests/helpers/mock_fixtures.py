@@ -1,3 +1,4 @@
+from unittest.mock import MagicMock
 import pytest
 import pandas as pd
 
@@ -24,3 +25,31 @@ def mock_gdf():
         "GMU": ["A", "B", "C"],
     }
     return pd.DataFrame(data)
+
+
+@pytest.fixture
+def mock_page():
+    """Builds a PDF page whose extract_text returns the given text."""
+
+    def page(text):
+        pdf_page = MagicMock()
+        pdf_page.extract_text.return_value = text
+        return pdf_page
+
+    return page
+
+
+@pytest.fixture
+def mock_hunt_df():
+    data = {
+        "unit": [1, 2],
+        "bulls": [1, 5],
+        "cows": [0, 0],
+        "calves": [0, 0],
+        "total_harvest": [1, 5],
+        "total_hunters": [6, 10],
+        "percent_success": [17, 50],
+        "total_rec_days": [29, 115],
+        "year": [2008, 2008],
+    }
+    return pd.DataFrame(data)
@@ -1,7 +1,17 @@
 import pytest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
-from app.cleaning.harvest import parse_rows, extract_archery_data
+import pandas as pd
+from app.cleaning.harvest import (
+    parse_rows,
+    split_page_sections,
+    parse_harvest_pdf,
+    parse_harvest_pdfs,
+    parse_pdf_harvest_data,
+    update_harvest_shards,
+    select_harvest_pages,
+)
+from tests.helpers.mock_fixtures import mock_page
 
 
 def test_parse_rows():
@@ -18,21 +28,132 @@ def test_parse_rows():
     assert parsed_list_of_lists[1] == ["31", "30", "11", "0", "41", "284", "14", "1772"]
 
 
-def test_extract_archery_data():
+def test_split_page_sections():
     archery_mid_page_path = (
         Path(__file__).parent.parent / "helpers" / "archery_mid_page.txt"
     )
     with archery_mid_page_path.open("r") as file:
-        archery_mid_page = file.read()
+        archery_mid_page = file.read().lower()
 
-    mock_page = MagicMock()
-    mock_page.extract_text.return_value = archery_mid_page
+    page_sections, section = split_page_sections(archery_mid_page, "rifle")
 
-    data = extract_archery_data(mock_page)
+    assert section == "archery"
+    assert [section for section, _ in page_sections] == ["rifle", "archery"]
+    assert parse_rows(page_sections[1][1]) == [
+        ["1", "1", "0", "0", "1", "6", "17", "29"]
+    ]
+
+
+def test_parse_pdf_harvest_data_sorts_rows_by_method_of_take(mock_page):
+    mock_reader = MagicMock()
+    mock_reader.pages = [
+        mock_page(
+            " 12006 Elk Harvest, Hunters and Recreation Days for All Manners of T ake\n"
+            " 1 1 0 0 1 6 17 29 \n"
+        ),
+        mock_page(
+            " 22006 Elk Harvest, Hunters and Recreation Days for All Manners of Take\n"
+            " 2 5 0 0 5 10 50 115 \n Total 6 0 0 6 16 38 144 \n"
+            "2006 Elk Harvest, Hunters and Recreation Days for First Rifle Seasons\n"
+            " 2 3 0 0 3 5 60 20 \n"
+        ),
+        mock_page(
+            " 32006 Elk Harvest, Hunters and Recreation Days for All Muzzl eloader Seasons\n"
+            " 2 1 0 0 1 3 33 9 \n"
+            "2006 Elk Harvest, Hunters and Recreation Days for All Archery Seasons\n"
+            " 1 1 0 0 1 6 17 29 \n"
+        ),
+    ]
+
+    df = parse_pdf_harvest_data(mock_reader, select_pages=False)
+
+    assert df[["method_of_take", "unit", "total_rec_days"]].values.tolist() == [
+        ["archery", 1, 29],
+        ["muzzleloader", 2, 9],
+        ["all", 1, 29],
+        ["all", 2, 115],
+    ]
+
+
+@patch("app.cleaning.harvest.PageTextCache")
+@patch("app.cleaning.harvest.PyPDF2.PdfReader")
+@patch("app.cleaning.harvest.parse_pdf_harvest_data")
+def test_parse_harvest_pdf_year(
+    mock_parse_pdf_harvest_data, mock_pdf_reader, mock_page_text_cache
+):
+    mock_parse_pdf_harvest_data.return_value = pd.DataFrame({"unit": [1, 2]})
+
+    df = parse_harvest_pdf(str(Path("pdf") / "harvest" / "2014StatewideElkHarvest.pdf"))
+
+    assert df.year.tolist() == [2014, 2014]
+
+
+@patch("app.cleaning.harvest.parse_harvest_pdf")
+def test_parse_harvest_pdfs_keeps_file_order(mock_parse_harvest_pdf):
+    mock_parse_harvest_pdf.side_effect = lambda pdf_file: pd.DataFrame(
+        {"year": [int(pdf_file[0:4])]}
+    )
+
+    all_data = parse_harvest_pdfs(["2007a.pdf", "2006b.pdf", "2008c.pdf"])
+
+    assert [df.year[0] for df in all_data] == [2007, 2006, 2008]
 
-    assert data == [
-        "archery seasons  ",
-        "     total total percent total ",
-        "unit  bulls cows calves harvest hunters success rec. days ",
-        " 1 1 0 0 1 6 17 29 ",
+
+@patch("app.cleaning.harvest.parse_harvest_pdf")
+def test_update_harvest_shards_only_parses_changed_files(
+    mock_parse_harvest_pdf, tmp_path
+):
+    mock_parse_harvest_pdf.side_effect = lambda pdf_file: pd.DataFrame(
+        {"unit": [1], "year": [int(Path(pdf_file).name[0:4])]}
+    )
+
+    pdf_files = []
+    for name in ["2006ElkHarvestSurvey.pdf", "2007ElkHarvestSurvey.pdf"]:
+        pdf_file = tmp_path / name
+        pdf_file.write_bytes(name.encode())
+        pdf_files.append(str(pdf_file))
+
+    shard_directory = tmp_path / "shards"
+
+    update_harvest_shards(pdf_files, shard_directory)
+    assert mock_parse_harvest_pdf.call_count == 2
+
+    update_harvest_shards(pdf_files, shard_directory)
+    assert mock_parse_harvest_pdf.call_count == 2
+
+    Path(pdf_files[1]).write_bytes(b"updated report")
+    new_pdf_file = tmp_path / "2008ElkHarvestSurvey.pdf"
+    new_pdf_file.write_bytes(b"new report")
+    pdf_files.append(str(new_pdf_file))
+
+    shard_paths = update_harvest_shards(pdf_files, shard_directory)
+    assert mock_parse_harvest_pdf.call_count == 4
+    assert [pd.read_csv(path).year[0] for path in shard_paths] == [2006, 2007, 2008]
+
+
+@patch("app.cleaning.harvest.page_head_text")
+def test_select_harvest_pages(mock_page_head_text):
+    mock_page_head_text.side_effect = [
+        " 35 2016 Elk Harvest, Hunters and Percent Success for Fourth Rifle Seasons",
+        " 36 2016 Elk Harvest, Hunters and Percent Success for Fourth Rifle Seasons",
+        " 37 2016 Elk Harvest, Hunters and Recreation Days for All Arche ry Seasons",
+        " 38 2016 Elk Harvest, Hunters and Recreation Days for All Archery Seasons",
+        " 39 2016 Elk Harvest, Hunters and Recreation Days for All Muzzleloader Seasons",
+        " 40 2016 Elk Harvest, Hunters and Percent Success for All Muzzleloader Seasons",
+        "",
     ]
+
+    mock_reader = MagicMock()
+    mock_reader.pages = [MagicMock() for _ in range(7)]
+
+    assert select_harvest_pages(mock_reader) == [1, 2, 3, 4, 6]
+
+
+@patch("app.cleaning.harvest.page_head_text")
+def test_select_harvest_pages_without_section_heading(mock_page_head_text):
+    mock_page_head_text.return_value = "2016 Elk Harvest for Fourth Rifle Seasons"
+
+    mock_reader = MagicMock()
+    mock_reader.pages = [MagicMock() for _ in range(3)]
+
+    assert select_harvest_pages(mock_reader) == [0, 1, 2]
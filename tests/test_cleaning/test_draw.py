@@ -0,0 +1,207 @@
+from unittest.mock import MagicMock, patch
+import pytest
+import pandas as pd
+from app.cleaning.draw import (
+    DRAW_RESULT_COLS,
+    DrawReportParser,
+    add_hunt_code_cols,
+    build_draw_dataset,
+    discover_draw_reports,
+    tokenize_draw_text,
+    write_draw_results,
+)
+from tests.helpers.mock_fixtures import mock_page
+
+
+def test_tokenize_draw_text():
+    text_data = (
+        "Drawn Out At Report 2024 Primary ELK \nHunt Code List "
+        "\nEE001E1R A \nDrawn Out At 19 Pref \nPoints \n30 Pref \nPoints \nNone "
+        "\nDrawn \nNone \nDrawn 4 Pref Points 2 Pref Points \n# Drawn at Final Level "
+        "1 of 3 1 of 1 N/A N/A 1 of 2 1 of 3"
+        "\nEF001O1A A \nDrawn Out At Leftover \nChoice 2 No Apps Choice 3 None Drawn "
+        "None Drawn 0 Pref \nPoints \n# Drawn at Final Level 2 of \n5 N/A N/A N/A N/A N/A"
+        "\n*  Hunts shaded in gray had fewer than 10 applicants"
+    )
+
+    assert tokenize_draw_text(text_data) == [
+        "Drawn Out At Report 2024 Primary ELK  Hunt Code List",
+        "EE001E1R A",
+        "DRA 19 30 ND ND 4  2",
+        "DAFL 1/3 1/1 N/A N/A 1/2 1/3",
+        "EF001O1A A",
+        "DRA Leftover-Choice-2 no-apps Choice-3 ND ND 0",
+        "DAFL 2/5 N/A N/A N/A N/A N/A",
+        "in gray had fewer than 10 applicants",
+    ]
+
+
+def test_iter_records_continues_hunt_code_after_page_break(mock_page):
+    pages = [
+        mock_page(
+            "Header \nEE001E1R A \nDrawn Out At 19 30 None Drawn None Drawn 4 2 "
+            "\n# Drawn at Final Level 1 of 3 1 of 1 N/A N/A 1 of 2 1 of 3"
+            "\nEE001O1A A \nDrawn Out At 17 None Drawn None Drawn None Drawn None Drawn None Drawn "
+        ),
+        mock_page(
+            "Header \nEE001O1A A \n# Drawn at Final Level 1 of 2 N/A N/A N/A N/A N/A"
+        ),
+    ]
+    parser = DrawReportParser(MagicMock(pages=pages))
+
+    records = parser.iter_records()
+
+    first_record = next(records)
+
+    assert first_record["hunt_code"] == "EE001E1R"
+    pages[1].extract_text.assert_not_called()
+
+    second_record = next(records)
+
+    assert second_record["hunt_code"] == "EE001O1A"
+    assert second_record["adult_res_draw_at"] == "17"
+    assert second_record["final_adult_res_draw_at"] == "1/2"
+    assert list(records) == []
+
+
+def test_iter_records_raises_on_unfinished_hunt_code(mock_page):
+    pages = [
+        mock_page("Header \nEE001E1R A \nDrawn Out At 19 30 ND ND 4 2 \nEE001O1A A "),
+    ]
+
+    with pytest.raises(ValueError, match="EE001O1A started before EE001E1R"):
+        list(DrawReportParser(MagicMock(pages=pages)).iter_records())
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_write_draw_results_in_batches(tmp_path, suffix):
+    records = (
+        dict(
+            zip(
+                DRAW_RESULT_COLS,
+                [f"EE{unit:03d}O1A", "A"] + ["ND"] * 6 + ["N/A"] * 6,
+            )
+        )
+        for unit in range(1, 8)
+    )
+    output_path = tmp_path / f"draw_results{suffix}"
+
+    assert write_draw_results(records, output_path, batch_size=3) == 7
+
+    if suffix == ".csv":
+        df = pd.read_csv(output_path, dtype=str)
+    else:
+        df = pd.read_parquet(output_path)
+
+    assert df.gmu.tolist() == [f"{unit:03d}" for unit in range(1, 8)]
+    assert df.method_of_take.unique().tolist() == ["Archery"]
+
+
+def test_discover_draw_reports(tmp_path):
+    for fname in [
+        "Drawn Out At Report 2024 Primary ELK.pdf",
+        "Drawn Out At Report 2023 Secondary Deer.pdf",
+        "2023StatewideElkHarvest.pdf",
+    ]:
+        (tmp_path / fname).touch()
+
+    reports = discover_draw_reports(tmp_path)
+
+    assert [
+        (report["species"], report["year"], report["draw_round"]) for report in reports
+    ] == [("deer", 2023, "secondary"), ("elk", 2024, "primary")]
+
+
+@patch("app.cleaning.draw.PageTextCache")
+@patch("app.cleaning.draw.CachedPdfReader")
+def test_build_draw_dataset_partitions_reports(
+    mock_cached_pdf_reader, mock_page_text_cache, mock_page, tmp_path
+):
+    pdf_directory = tmp_path / "draw_result"
+    pdf_directory.mkdir()
+
+    (pdf_directory / "Drawn Out At Report 2024 Primary ELK.pdf").touch()
+    (pdf_directory / "Drawn Out At Report 2024 Primary DEER.pdf").touch()
+
+    def reader(pdf_path, *args, **kwargs):
+        hunt_code = "DM" if "DEER" in pdf_path.name else "EE"
+
+        return MagicMock(
+            pages=[
+                mock_page(
+                    f"Header \n{hunt_code}001O1A A \nDrawn Out At 1 ND ND ND ND ND "
+                    "\n# Drawn at Final Level 1 of 2 N/A N/A N/A N/A N/A"
+                )
+            ]
+        )
+
+    mock_cached_pdf_reader.side_effect = reader
+
+    output_directory = tmp_path / "draw_results"
+
+    assert build_draw_dataset(pdf_directory, output_directory) == 2
+
+    df = pd.read_parquet(output_directory)
+
+    assert sorted(zip(df.species.astype(str), df.hunt_code)) == [
+        ("deer", "DM001O1A"),
+        ("elk", "EE001O1A"),
+    ]
+    assert (
+        output_directory
+        / "species=deer"
+        / "year=2024"
+        / "draw_round=primary"
+        / "draw_results.parquet"
+    ).exists()
+
+
+@patch("app.cleaning.draw.PageTextCache")
+@patch("app.cleaning.draw.CachedPdfReader")
+def test_build_draw_dataset_keeps_previous_dataset_on_failure(
+    mock_cached_pdf_reader, mock_page_text_cache, mock_page, tmp_path
+):
+    pdf_directory = tmp_path / "draw_result"
+    pdf_directory.mkdir()
+
+    output_directory = tmp_path / "draw_results"
+    (output_directory / "species=elk").mkdir(parents=True)
+    (output_directory / "species=elk" / "draw_results.parquet").touch()
+
+    with pytest.raises(ValueError, match="No drawn out at reports"):
+        build_draw_dataset(pdf_directory, output_directory)
+
+    (pdf_directory / "Drawn Out At Report 2024 Primary ELK.pdf").touch()
+
+    mock_cached_pdf_reader.return_value = MagicMock(
+        pages=[mock_page("Header \nEE001O1A A \n# Drawn at Final Level 1 of 2")]
+    )
+
+    with pytest.raises(ValueError, match="Expected 6 values"):
+        build_draw_dataset(pdf_directory, output_directory)
+
+    assert (output_directory / "species=elk" / "draw_results.parquet").exists()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "draw_result",
+        "draw_results",
+    ]
+
+
+def test_add_hunt_code_cols():
+    df = pd.DataFrame(
+        {
+            "hunt_code": ["EE001O1A", "DM123P2R", "EP99999P", "EE0010O1A", "EE01"],
+            "list_code": ["A", "B", "A", "C", "A"],
+        }
+    )
+
+    df = add_hunt_code_cols(df)
+
+    assert df.species.tolist()[:3] == ["elk", "deer", "elk"]
+    assert df.animal_sex.tolist()[:3] == ["Either Sex", "Male", "Preference Point"]
+    assert df.gmu.tolist()[:3] == ["001", "123", "999"]
+    assert df.hunt_type.tolist()[:2] == ["O", "P"]
+    assert df.season.tolist()[:3] == [1, 2, 9]
+    assert df.method_of_take.tolist()[:3] == ["Archery", "rifle", "NA"]
+    assert df.species.dtype == "category"
+    assert df.iloc[3:].drop(columns=["hunt_code", "list_code"]).isna().all().all()
@@ -0,0 +1,88 @@
+import geopandas as gpd
+import math
+import pytest
+import numpy as np
+import shapely
+from shapely.geometry import Polygon, box
+from app.cleaning.geo import (
+    build_geo_store,
+    prepare_gmu_geometries,
+    simplify_coverage,
+    zoom_level_column,
+)
+
+
+def test_prepare_gmu_geometries():
+    wiggly_square = Polygon(
+        [(0, 0), (0.5, 0.0001), (1, 0), (1, 1), (0.5, 1.0001), (0, 1)]
+    )
+    gdf = gpd.GeoDataFrame(
+        {"GMUID": [61], "COUNTY": ["MONTROSE SAN MIGUEL"], "ELKDAU": ["E-20"]},
+        geometry=[wiggly_square],
+    )
+
+    prepared_gdf = prepare_gmu_geometries(gdf, tolerances=(0.00001, 0.01))
+
+    assert prepared_gdf.columns.tolist() == [
+        "GMU",
+        "County",
+        "Elk DAU",
+        "geometry",
+        "geometry_0.01",
+    ]
+    assert prepared_gdf.County[0] == "Montrose/San/Miguel"
+    assert len(prepared_gdf.geometry[0].exterior.coords) == 7
+    assert len(prepared_gdf["geometry_0.01"][0].exterior.coords) == 5
+
+
+def test_zoom_level_column():
+    assert zoom_level_column(5) == "geometry_0.03"
+    assert zoom_level_column(4) == "geometry_0.03"
+    assert zoom_level_column(7) == "geometry_0.008"
+    assert zoom_level_column(8) == "geometry"
+    assert zoom_level_column(14) == "geometry"
+
+
+def test_prepare_gmu_geometries_keeps_shared_borders():
+    # Unit 1 borders units 2 and 3 along a wiggly line, simplified one at a time
+    # the units straighten it differently and overlap.
+    border = [(1 + 0.02 * math.sin(i * 1.7), i / 20) for i in range(21)]
+    gdf = gpd.GeoDataFrame(
+        {"GMUID": [1, 2, 3], "COUNTY": ["A", "B", "C"], "ELKDAU": ["E-1"] * 3},
+        geometry=[
+            Polygon([(0, 0)] + border + [(0, 1)]),
+            Polygon([(2, 0.3), (2, 1)] + border[:5:-1]),
+            Polygon([(2, 0), (2, 0.3)] + border[6::-1]),
+        ],
+    )
+
+    prepared_gdf = prepare_gmu_geometries(gdf, tolerances=(0.03,))
+
+    assert len(prepared_gdf.geometry[0].exterior.coords) < 23
+    assert shapely.coverage_is_valid(prepared_gdf.geometry.values)
+    assert prepared_gdf.area.sum() == pytest.approx(2)
+    assert prepared_gdf.union_all().area == pytest.approx(2)
+
+
+def test_simplify_coverage_snaps_coordinates_to_the_level_grid():
+    polygons = np.array(
+        [
+            box(0.123456, 0.0, 1.0, 1.000049),
+            box(1.0, 0.0, 2.000051, 1.000049),
+        ]
+    )
+
+    simplified = simplify_coverage(polygons, 0.003)
+
+    assert shapely.get_coordinates(simplified).max(axis=0).tolist() == [2.0001, 1.0]
+    assert shapely.get_coordinates(simplified).min(axis=0).tolist() == [0.1235, 0.0]
+    assert shapely.coverage_is_valid(simplified)
+    assert shapely.equals(
+        simplify_coverage(polygons, 0.003, quantize=False), polygons
+    ).all()
+
+
+def test_build_geo_store_skips_missing_geojson(tmp_path):
+    build_geo_store(tmp_path / "cpw_gmu.geojson", tmp_path / "cpw_gmu.parquet")
+
+    assert not (tmp_path / "cpw_gmu.parquet").exists()
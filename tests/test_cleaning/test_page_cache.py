@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock
+from PyPDF2 import PageObject
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+from app.cleaning.page_cache import PageTextCache, CachedPdfReader, extract_head_text
+
+
+def test_page_text_cache_evicts_least_recently_used(tmp_path):
+    cache = PageTextCache(tmp_path / "page_text.sqlite", max_bytes=10)
+
+    cache.put("pdf", 0, "v1", "aaaa")
+    cache.put("pdf", 1, "v1", "bbbb")
+
+    assert cache.get("pdf", 0, "v1") == "aaaa"
+
+    cache.put("pdf", 2, "v1", "cccc")
+
+    assert cache.get("pdf", 0, "v1") == "aaaa"
+    assert cache.get("pdf", 1, "v1") is None
+    assert cache.get("pdf", 2, "v1") == "cccc"
+    assert cache.get("pdf", 2, "v2") is None
+
+
+def test_cached_pdf_reader_only_extracts_once(tmp_path):
+    pdf_path = tmp_path / "report.pdf"
+    pdf_path.write_bytes(b"fake pdf")
+
+    mock_page = MagicMock()
+    mock_page.extract_text.return_value = "2008 Elk Harvest for All Archery Seasons"
+    mock_reader_class = MagicMock()
+    mock_reader_class.return_value.pages = [mock_page]
+
+    cache = PageTextCache(tmp_path / "page_text.sqlite")
+
+    for _ in range(2):
+        reader = CachedPdfReader(pdf_path, mock_reader_class, "v1", cache=cache)
+
+        assert [page.extract_text() for page in reader.pages] == [
+            "2008 Elk Harvest for All Archery Seasons"
+        ]
+
+    assert mock_reader_class.call_count == 1
+    assert mock_page.extract_text.call_count == 1
+
+
+def test_page_text_cache_tracks_size_and_closes(tmp_path):
+    with PageTextCache(tmp_path / "page_text.sqlite", max_bytes=10) as cache:
+        cache.put("pdf", 0, "v1", "aaaa")
+        cache.put("pdf", 0, "v1", "aa")
+        cache.put("pdf", 1, "v1", "bbbb")
+
+        assert cache.total_bytes == 6
+
+    with PageTextCache(tmp_path / "page_text.sqlite", max_bytes=10) as cache:
+        assert cache.total_bytes == 6
+
+
+def _text_page(content: bytes) -> PageObject:
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+
+    page = PageObject.create_blank_page(width=200, height=200)
+    page[NameObject("/Resources")] = DictionaryObject(
+        {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+    )
+
+    stream = DecodedStreamObject()
+    stream.set_data(content)
+    page[NameObject("/Contents")] = stream
+
+    return page
+
+
+def test_extract_head_text():
+    page = _text_page(
+        b"BT /F1 12 Tf 10 150 Td (Elk Harvest) Tj ET BT /F1 12 Tf 10 50 Td (Rest) Tj ET"
+    )
+
+    assert extract_head_text(page, 50) == "Elk Harvest"
+
+    # No complete text object in the head
+    assert extract_head_text(page, 39) == "Elk Harvest"
+
+    assert extract_head_text(PageObject.create_blank_page(width=1, height=1), 50) == ""
@@ -0,0 +1,49 @@
+import pandas as pd
+from app.cleaning.population import parse_population_rows, summarize_dau_harvest
+
+
+def test_parse_population_rows():
+    page_text = (
+        "DAU*   GAME MANAGEMENT UNITS INVOLVED in 2019    Estimate    (per 100)\n"
+        "  1    2, 201                                       1,670        22\n"
+        " 10    21, 22, 30, 31, 32                          12,420        24\n"
+        "01   Cold Springs   2, 201                          1,500        37\n"
+        "99   eastern plains units not in a DAU                  0\n"
+        "Total Statewide Estimate                          292,760\n"
+    )
+
+    rows = parse_population_rows(page_text)
+
+    assert [row["dau"] for row in rows] == [1, 10, 1]
+    assert rows[1]["units"] == "21, 22, 30, 31, 32"
+    assert rows[1]["post_hunt_estimate"] == 12420
+    assert rows[0]["herd_name"] is None
+    assert rows[2]["herd_name"] == "Cold Springs"
+
+
+def test_summarize_dau_harvest():
+    population_df = pd.DataFrame(
+        {
+            "year": [2023, 2023],
+            "dau": [1, 47],
+            "herd_name": ["Cold Springs", "Green River"],
+            "units": ["2, 201", "1"],
+            "post_hunt_estimate": [1500, 200],
+            "bull_cow_ratio": [78, 33],
+        }
+    )
+    harvest_df = pd.DataFrame(
+        {
+            "unit": [2, 201, 2, 1],
+            "total_harvest": [150, 46, 20, 9],
+            "total_hunters": [300, 57, 90, 40],
+            "method_of_take": ["all", "all", "archery", "archery"],
+            "year": [2023, 2023, 2023, 2023],
+        }
+    )
+
+    dau_df = summarize_dau_harvest(population_df, harvest_df)
+
+    assert dau_df.dau_harvest.tolist() == [196, pd.NA]
+    assert dau_df.harvest_population_ratio[0] == 0.131
+    assert dau_df.hunters_per_1000_elk[0] == 238.0
@@ -0,0 +1,85 @@
+import pytest
+import pandas as pd
+from app.cleaning.store import join_hunting_data
+from tests.helpers.mock_fixtures import mock_hunt_df
+
+
+def test_join_hunting_data(mock_hunt_df):
+    otc_df = pd.DataFrame(
+        {
+            "GMUID": [1],
+            "private_either_sex": [True],
+            "private_female": [False],
+            "public_either_sex": [True],
+            "public_female": [False],
+            "no_over_the_counter": [False],
+        }
+    )
+
+    dau_df = pd.DataFrame(
+        {
+            "year": [2008],
+            "units": ["2, 201"],
+            "post_hunt_estimate": [1500],
+            "bull_cow_ratio": [78],
+            "harvest_population_ratio": [0.131],
+            "hunters_per_1000_elk": [238.0],
+        }
+    )
+
+    df = join_hunting_data(mock_hunt_df, otc_df, dau_df)
+
+    assert df.Unit.dtype == "category"
+    assert df.Year.dtype == "int16"
+    assert df["Public Either Sex"].tolist() == [True, False]
+    assert df["No Over The Counter"].tolist() == [False, True]
+    assert df["Post Hunt Estimate"].tolist()[1] == 1500
+    assert df["Post Hunt Estimate"].isna().tolist() == [True, False]
+
+
+def test_join_hunting_data_keeps_otc_no_over_the_counter(mock_hunt_df):
+
+    # otc.csv marks unit 1 as having OTC licenses although none of OTC_COLS is set
+    otc_df = pd.DataFrame(
+        {
+            "GMUID": [1],
+            "private_either_sex": [False],
+            "private_female": [False],
+            "public_either_sex": [False],
+            "public_female": [False],
+            "no_over_the_counter": [False],
+        }
+    )
+
+    df = join_hunting_data(mock_hunt_df, otc_df)
+
+    assert df["No Over The Counter"].tolist() == [False, True]
+
+
+def test_join_hunting_data_rejects_unit_in_two_daus(mock_hunt_df):
+    dau_df = pd.DataFrame(
+        {
+            "year": [2008, 2008],
+            "units": ["2, 201", "2, 3"],
+            "post_hunt_estimate": [1500, 800],
+            "bull_cow_ratio": [78, 20],
+            "harvest_population_ratio": [0.131, 0.2],
+            "hunters_per_1000_elk": [238.0, 100.0],
+        }
+    )
+
+    with pytest.raises(pd.errors.MergeError):
+        join_hunting_data(
+            mock_hunt_df,
+            pd.DataFrame(
+                columns=[
+                    "GMUID",
+                    "private_either_sex",
+                    "private_female",
+                    "public_either_sex",
+                    "public_female",
+                    "no_over_the_counter",
+                ]
+            ),
+            dau_df,
+        )
@@ -0,0 +1 @@
+# This file is intentionally left blank to make this directory a package.
@@ -0,0 +1,39 @@
+import sys
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from app.helpers.cache_state import _load_app_data
+
+
+def test_main_imports_do_not_load_heavy_libraries():
+    """Text only pages should not wait on the data libraries, see cache_state."""
+    code = (
+        "import sys, app.helpers.cache_state, app.helpers.timing; "
+        "print(','.join(m for m in ('pandas', 'geopandas', 'shapely', 'pypdf', 'pyarrow') if m in sys.modules))"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parent.parent.parent / "src",
+    )
+
+    assert result.stdout.strip() == ""
+
+
+@patch("app.helpers.cache_state.get_hunting_index")
+def test_load_app_data_skips_missing_assets(mock_get_hunting_index):
+    mock_get_hunting_index.side_effect = FileNotFoundError("hunting_data.feather")
+
+    _load_app_data()
+
+
+@patch("app.helpers.cache_state.get_hunting_index")
+def test_load_app_data_raises_other_errors(mock_get_hunting_index):
+    mock_get_hunting_index.side_effect = KeyError("Unit")
+
+    with pytest.raises(KeyError):
+        _load_app_data()
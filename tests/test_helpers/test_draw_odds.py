@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from app.helpers.draw_odds import DrawOddsIndex, normalize_draw_at
+
+
+def test_normalize_draw_at_sorts_easiest_first():
+    draw_points = normalize_draw_at(
+        pd.Series(["12", "0", "Choice-2", "Choice-4", "Leftover", "ND", "no-apps"])
+    )
+
+    np.testing.assert_array_equal(draw_points, [12, 0, -1, -3, -10, np.nan, np.nan])
+
+
+def test_drawable_matches_scan():
+    draw_df = pd.DataFrame(
+        {
+            "hunt_code": ["EE001O1A", "EE002O1A", "EE003O1A", "EE004O1A", "EE005O1A"],
+            "adult_res_draw_at": ["3", "Choice-2", "ND", "0", "7"],
+            "adult_nonrest_draw_at": ["5", "Leftover", "no-apps", "2", "ND"],
+            "youth_res_draw_at": ["0"] * 5,
+            "youth_nonrest_draw_at": ["0"] * 5,
+            "species": ["elk"] * 5,
+            "year": [2024] * 5,
+            "draw_round": ["primary"] * 5,
+        }
+    )
+
+    # The same hunt codes a year earlier, all drew with 0 points
+    draw_df = pd.concat(
+        [
+            draw_df,
+            draw_df.assign(
+                year=2023,
+                adult_res_draw_at="0",
+                hunt_code=draw_df.hunt_code.str.replace("A", "B"),
+            ),
+        ]
+    )
+
+    draw_odds_index = DrawOddsIndex(draw_df)
+
+    def drawable(category, preference_points, year=2024):
+        return draw_odds_index.drawable(
+            category, preference_points, "elk", year, "primary"
+        )
+
+    assert drawable("Adult Resident", 3).hunt_code.tolist() == [
+        "EE001O1A",
+        "EE004O1A",
+        "EE002O1A",
+    ]
+    assert drawable("Adult Nonresident", 1).hunt_code.tolist() == ["EE002O1A"]
+    assert drawable("Adult Resident", 40).draw_points.max() == 7
+    assert len(drawable("Adult Resident", 0, year=2023)) == 5
+    assert drawable("Adult Resident", 3, year=2022).empty
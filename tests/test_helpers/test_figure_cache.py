@@ -0,0 +1,23 @@
+from app.helpers.figure_cache import FigureCache
+
+
+def test_figure_cache_evicts_least_recently_used():
+    figure_cache = FigureCache(maxsize=2)
+    built = []
+
+    def build(key):
+        def _build():
+            built.append(key)
+            return f"figure {key}"
+
+        return _build
+
+    assert figure_cache.get_or_build(2022, build(2022)) == "figure 2022"
+    figure_cache.get_or_build(2023, build(2023))
+    figure_cache.get_or_build(2022, build(2022))
+    figure_cache.get_or_build(2021, build(2021))
+    figure_cache.get_or_build(2022, build(2022))
+    figure_cache.get_or_build(2023, build(2023))
+
+    assert built == [2022, 2023, 2021, 2023]
+    assert figure_cache.stats() == {"hits": 2, "misses": 4, "size": 2, "maxsize": 2}
@@ -0,0 +1,49 @@
+import geopandas as gpd
+from shapely.geometry import box
+from app.helpers.gmu_index import GmuIndex
+
+
+def grid_gmu_index() -> GmuIndex:
+    """3 x 3 grid of unit squares, GMU 1 in the south west corner, 9 in the north east."""
+    return GmuIndex(
+        gpd.GeoDataFrame(
+            {"GMU": range(1, 10)},
+            geometry=[box(i % 3, i // 3, i % 3 + 1, i // 3 + 1) for i in range(9)],
+            crs="EPSG:4326",
+        )
+    )
+
+
+def test_locate():
+    gmu_index = grid_gmu_index()
+
+    assert gmu_index.locate(0.5, 0.5) == 1
+    assert gmu_index.locate(2.5, 1.5) == 6
+    assert gmu_index.locate(5, 5) is None
+
+
+def test_neighbours_share_a_border():
+    gmu_index = grid_gmu_index()
+
+    # Units that only meet the center at a corner, like 1, are not neighbours
+    assert gmu_index.neighbours(5) == [2, 4, 6, 8]
+    assert gmu_index.neighbours(1) == [2, 4]
+    assert gmu_index.neighbours(42) == []
+
+
+def test_neighbour_offsets_match_neighbours():
+    gmu_index = grid_gmu_index()
+
+    for i, gmu in enumerate(gmu_index.gmus):
+        start, end = gmu_index.neighbour_offsets[i : i + 2]
+
+        assert gmu_index.gmus[
+            gmu_index.neighbour_positions[start:end]
+        ].tolist() == gmu_index.neighbours(gmu)
+
+
+def test_in_bounds():
+    gmu_index = grid_gmu_index()
+
+    assert gmu_index.in_bounds(0.2, 0.2, 1.5, 0.8) == [1, 2]
+    assert gmu_index.in_bounds(10, 10, 11, 11) == []
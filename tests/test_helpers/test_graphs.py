@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+import pandas as pd
+import geopandas as gpd
+import plotly.graph_objects as go
+from shapely.geometry import box
+from app.helpers.graphs import (
+    gmu_geo_json,
+    highlight_units,
+    map_geometry_col,
+    plot_neighbour_comparison,
+    summarize_statewide,
+)
+from tests.helpers.mock_fixtures import mock_hunter_df
+
+
+def test_gmu_geo_json_uses_gmu_as_feature_id():
+    gdf = gpd.GeoDataFrame(
+        {"GMU": [61, 62], "County": ["Montrose", "Montrose"]},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)],
+    )
+
+    geo_json = gmu_geo_json(gdf)
+
+    assert [feature["id"] for feature in geo_json["features"]] == ["61", "62"]
+    assert geo_json["features"][0]["properties"] == {}
+
+
+def test_gmu_geo_json_serializes_geometry_col():
+    gdf = gpd.GeoDataFrame(
+        {"GMU": [61], "geometry_0.01": gpd.GeoSeries([box(0, 0, 2, 2)])},
+        geometry=[box(0, 0, 1, 1)],
+    )
+
+    geo_json = gmu_geo_json(gdf, "geometry_0.01")
+
+    assert geo_json["features"][0]["geometry"]["coordinates"][0][0] == [2.0, 0.0]
+    assert gdf.geometry.name == "geometry"
+
+
+def test_summarize_statewide(mock_hunter_df):
+    hunter_df = pd.concat([mock_hunter_df, mock_hunter_df.assign(GMU=4)])
+    hunter_df["Total Rec Days"] = 10
+    hunter_df["Percent Success"] = [10, 20, 30, 40, 20, 30]
+    hunter_df["Total Hunters"] = [100, 200, 300, 300, 200, 300]
+
+    statewide_df = summarize_statewide(hunter_df)
+
+    assert statewide_df.Year.tolist() == [2020, 2021, 2022]
+    assert statewide_df.Bulls.tolist() == [20, 40, 60]
+    assert statewide_df["Percent Success"].tolist() == [25, 20, 30]
+    assert statewide_df["Weighted Percent Success"].tolist() == [32, 20, 30]
+
+
+def test_map_geometry_col_gives_desktop_more_detail():
+    assert map_geometry_col(5, is_mobile=True) == "geometry_0.03"
+    assert map_geometry_col(5, is_mobile=False) == "geometry_0.008"
+    assert map_geometry_col(7, is_mobile=True) == "geometry_0.008"
+    assert map_geometry_col(7, is_mobile=False) == "geometry"
+
+
+def test_highlight_units_outlines_only_unit_and_neighbours():
+    gdf = gpd.GeoDataFrame(
+        {"GMU": [61, 62, 63]},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1), box(5, 5, 6, 6)],
+    )
+    geo_json = gmu_geo_json(gdf)
+    fig = go.Figure(
+        go.Choroplethmapbox(
+            geojson=geo_json,
+            featureidkey="id",
+            locations=["61", "62", "63"],
+            z=[1, 2, 3],
+        )
+    )
+
+    highlighted_fig = highlight_units(fig, 61, [62])
+
+    outline = highlighted_fig.data[-1]
+
+    assert len(fig.data) == 1
+    assert list(outline.locations) == ["61", "62"]
+    assert [feature["id"] for feature in outline.geojson["features"]] == ["61", "62"]
+    assert list(outline.marker.line.color) == ["#d62728", "#ff7f0e"]
+
+
+def test_highlight_units_keeps_geo_json_url():
+    fig = go.Figure(
+        go.Choroplethmapbox(
+            geojson="app/static/cpw_gmu_0123456789ab.geojson",
+            featureidkey="id",
+            locations=["61"],
+            z=[1],
+        )
+    )
+
+    outline = highlight_units(fig, 61, []).data[-1]
+
+    assert outline.geojson == "app/static/cpw_gmu_0123456789ab.geojson"
+    assert list(outline.locations) == ["61"]
+
+
+def test_plot_neighbour_comparison_drops_years_without_hunters(monkeypatch):
+    monkeypatch.setattr(
+        "app.helpers.graphs.st.session_state", SimpleNamespace(trend_update_layout={})
+    )
+    unit_df = pd.DataFrame({"Year": [2020, 2021], "Percent Success": [12.0, 20.0]})
+    neighbour_df = pd.DataFrame(
+        {"Year": [2020, 2021], "Percent Success": [float("nan"), 15.27]}
+    )
+
+    fig = plot_neighbour_comparison(unit_df, neighbour_df, "Percent Success", 61)
+
+    unit_trace, neighbour_trace = fig.data
+
+    assert list(unit_trace.text) == ["12.0", "20.0"]
+    assert list(neighbour_trace.x) == [2021]
+    assert list(neighbour_trace.text) == ["15.3"]
+    assert fig.layout.title.text == "Percent Success: GMU 61 and its Neighbours"
@@ -0,0 +1,43 @@
+import pandas as pd
+from app.helpers.hunting_index import HuntingIndex
+
+
+def _hunter_df():
+    return pd.DataFrame(
+        {
+            "Unit": pd.Categorical([62, 61, 61, 62, 61, 10]),
+            "Year": [2021, 2022, 2020, 2020, 2021, 2021],
+            "Total Hunters": [200, 130, 110, 180, 120, 50],
+        }
+    )
+
+
+def test_unit_series_matches_year_range():
+    hunting_index = HuntingIndex(_hunter_df())
+
+    assert hunting_index.units == [10, 61, 62]
+    assert hunting_index.unit_series(61)["Year"].tolist() == [2020, 2021, 2022]
+    assert hunting_index.unit_series(61, (2021, 2022))["Total Hunters"].tolist() == [
+        120,
+        130,
+    ]
+    assert hunting_index.unit_series(61, (2023, 2024)).empty
+    assert hunting_index.unit_series(99).empty
+
+
+def test_year_slice_matches_mask():
+    hunter_df = _hunter_df()
+    hunting_index = HuntingIndex(hunter_df)
+
+    assert hunting_index.years == [2020, 2021, 2022]
+
+    for year in hunting_index.years:
+        expected = hunter_df.loc[hunter_df.Year == year].sort_values("Unit")
+
+        assert (
+            hunting_index.year_slice(year)
+            .reset_index(drop=True)
+            .equals(expected.reset_index(drop=True))
+        )
+
+    assert hunting_index.year_slice(1999).empty
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from shapely.geometry import box
+from app.helpers.gmu_index import GmuIndex
+from app.helpers.hunting_index import HuntingIndex
+from app.helpers.neighbours import neighbour_averages, sparse_matmul
+
+
+def test_sparse_matmul_matches_dense():
+    offsets, positions = np.array([0, 2, 2, 3]), np.array([1, 2, 0])
+
+    dense = np.zeros((3, 3))
+    dense[[0, 0, 2], positions] = 1
+
+    values = np.arange(12.0).reshape(3, 4)
+
+    assert np.array_equal(sparse_matmul(offsets, positions, values), dense @ values)
+
+
+def test_sparse_matmul_keeps_nan_in_its_row():
+    offsets, positions = np.array([0, 1, 2, 3, 3]), np.array([1, 2, 0])
+
+    values = np.array([[1.0], [np.nan], [3.0]])
+
+    result = sparse_matmul(offsets, positions, values)
+
+    assert np.array_equal(result, [[np.nan], [3.0], [1.0], [0.0]], equal_nan=True)
+
+
+def test_neighbour_averages():
+    # Units 1, 2 and 3 in a row, 99 has no boundary
+    gmu_index = GmuIndex(
+        gpd.GeoDataFrame(
+            {"GMU": [1, 2, 3]},
+            geometry=[box(i, 0, i + 1, 1) for i in range(3)],
+        )
+    )
+
+    hunter_df = pd.DataFrame(
+        {
+            "Unit": pd.Categorical([1, 3, 1, 2, 3, 99]),
+            "Year": [2020, 2020, 2021, 2021, 2021, 2021],
+            "Bulls": [10, 20, 30, 40, 50, 60],
+            "Cows": [0, 0, 0, 0, 0, 0],
+            "Calves": [0, 0, 0, 0, 0, 0],
+            "Total Harvest": [10, 20, 30, 40, 50, 60],
+            "Total Hunters": [100, 100, 100, 200, 300, 400],
+            "Percent Success": [10, 20, 30, 20, 17, 15],
+        }
+    )
+
+    neighbour_df = neighbour_averages(HuntingIndex(hunter_df), gmu_index)
+
+    # Unit 2 did not report 2020, its neighbours did. Unit 99 has no neighbours.
+    assert neighbour_df[["Unit", "Year"]].values.tolist() == [
+        [1, 2021],
+        [2, 2020],
+        [2, 2021],
+        [3, 2021],
+    ]
+
+    unit_2 = neighbour_df.loc[neighbour_df.Unit == 2]
+
+    assert unit_2.Bulls.tolist() == [15.0, 40.0]
+    assert unit_2["Reporting Neighbours"].tolist() == [2, 2]
+    # Weighted by hunters: (10 * 100 + 20 * 100) / 200, (30 * 100 + 17 * 300) / 400
+    assert unit_2["Percent Success"].tolist() == [15, 20]
@@ -0,0 +1,47 @@
+import json
+import logging
+import pandas as pd
+from app.helpers.timing import page_run, stage, timed, record_size, current_run
+
+
+def test_page_run_records_nested_stages_and_logs_them(caplog):
+    @timed()
+    def build_figure():
+        with stage("geo merge"):
+            record_size("merged units", pd.DataFrame({"a": [1, 2]}))
+
+        return "figure"
+
+    with caplog.at_level(logging.INFO, logger="app.helpers.timing"):
+        with page_run("Interactive Map") as run_timings:
+            with stage("get figure"):
+                assert build_figure() == "figure"
+
+            record_size("figure json", '{"data": []}')
+
+    assert current_run() is None
+    assert [(s["stage"], s["depth"]) for s in run_timings.stages] == [
+        ("merged units", 3),
+        ("geo merge", 2),
+        ("build_figure", 1),
+        ("get figure", 0),
+        ("figure json", 0),
+    ]
+    assert run_timings.stages[-1]["bytes"] == 12
+    assert run_timings.total_ms >= run_timings.stages[3]["ms"]
+
+    logged = json.loads(caplog.records[-1].getMessage().removeprefix("page run "))
+
+    assert logged["page"] == "Interactive Map"
+    assert len(logged["stages"]) == 5
+    assert list(run_timings.to_frame().stage)[:2] == [
+        "      merged units",
+        "    geo merge",
+    ]
+
+
+def test_stage_outside_page_run_is_not_recorded():
+    with stage("load data"):
+        record_size("hunting data", b"1234")
+
+    assert current_run() is None